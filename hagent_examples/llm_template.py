@@ -1,12 +1,53 @@
 # See LICENSE for details
 
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+import string
 import yaml
 import os
 # from jinja2 import Environment
 
+from hagent.core.yaml_utils import YamlLoader
+
+# Parsed template files keyed by path, reused while the file mtime is unchanged
+_parsed_files: Dict[str, Tuple[float, List]] = {}
+
+
+def _load_template_file(path: str) -> List:
+    mtime = os.path.getmtime(path)
+    cached = _parsed_files.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'r') as f:
+        data = yaml.load(f, Loader=YamlLoader)
+    _parsed_files[path] = (mtime, data)
+    return data
+
+
+_formatter = string.Formatter()
+
+_ALLOWED_ROLES = frozenset(('user', 'system', 'assistant'))
+
+
+def _compile_format(value: str) -> Optional[Tuple[Tuple[str, Optional[str]], ...]]:
+    """
+    Splits a format string into (literal, field_name) parts once, so format() can join
+    them without re-parsing. Returns None when the string needs the full str.format
+    machinery (format specs, conversions, attribute/index access or malformed braces).
+    """
+    parts = []
+    try:
+        for literal, field, spec, conversion in _formatter.parse(value):
+            if field is not None and (spec or conversion or not field.isidentifier()):
+                return None
+            parts.append((literal, field))
+    except ValueError:
+        return None
+    return tuple(parts)
+
 
 class LLM_template:
+    __slots__ = ('file_name', 'last_error', 'template_dict', '_valid', '_compiled')
+
     def validate_template(self, data):  # No type check, because it generates errors for incorrect types
         if not isinstance(data, list):
             return 'the data is not a list'
@@ -14,7 +55,11 @@ class LLM_template:
         if not data:
             return 'the list is empty.'
 
-        allowed_roles = {'user', 'system', 'assistant'}
+        # Fast path for valid templates, the loop below only runs to build the error message
+        if all(isinstance(item, dict) and item.get('role', None) in _ALLOWED_ROLES and 'content' in item for item in data):
+            if data[-1]['role'] != 'user':
+                return "the last item's role must be 'user'."
+            return None
 
         for index, item in enumerate(data):
             if not isinstance(item, dict):
@@ -28,18 +73,15 @@ class LLM_template:
 
             # Check if the 'role' is valid
             role = item['role']
-            if role not in allowed_roles:
+            if role not in _ALLOWED_ROLES:
                 return f"invalid role '{role}' at index {index}. Allowed roles are 'user', 'system', or 'assistant'."
 
-        # Check if the last item's role is 'user'
-        if data[-1]['role'] != 'user':
-            return "the last item's role must be 'user'."
-
-        return None
+        return None  # not reached: the fast path accepts anything this loop does not reject
 
     def __init__(self, data):
         self.file_name = ''
         self.last_error = ''
+        self._valid = False  # errors from format() do not invalidate the template
         if isinstance(data, str):
             if not os.path.exists(data):
                 dir = os.path.dirname(os.path.abspath(__file__))
@@ -47,8 +89,7 @@ class LLM_template:
                 if os.path.exists(inp_file):
                     data = inp_file
             try:
-                with open(data, 'r') as f:
-                    self.template_dict = yaml.safe_load(f)
+                self.template_dict = _load_template_file(data)
                 self.file_name = data
             except FileNotFoundError:
                 self.last_error = f"LLM_template, file '{data}' does not exist"
@@ -63,31 +104,52 @@ class LLM_template:
             err = self.validate_template(self.template_dict)
             if err is not None:
                 self.last_error = f'LLM_template file {data} fails because {err}'
+            else:
+                self._valid = True
+                self._compile()
         else:
             print('ERROR:', self.last_error)
 
+    def _compile(self):
+        # Per item: the static dict when no placeholder appears, or the compiled parts per string key
+        self._compiled = []
+        for item in self.template_dict:
+            parts_by_key = {}
+            for key, value in item.items():
+                if isinstance(value, str):
+                    parts_by_key[key] = _compile_format(value)
+            if any(parts is None or any(field is not None for _, field in parts) for parts in parts_by_key.values()):
+                self._compiled.append((None, parts_by_key))
+            else:
+                static = dict(item)
+                for key, parts in parts_by_key.items():
+                    static[key] = ''.join(literal for literal, _ in parts)  # unescapes '{{' and '}}'
+                self._compiled.append((static, None))
+
     def format(self, context: Dict) -> List[Dict]:
-        if self.last_error:
+        if not self._valid:
             return [{'error': self.last_error}]
 
         result = []
-        for item in self.template_dict:
+        for item, (static, parts_by_key) in zip(self.template_dict, self._compiled):
+            if static is not None:
+                result.append(dict(static))
+                continue
             ctx = {}
-            if isinstance(item, dict):
-                for key, value in item.items():
-                    if isinstance(value, str):
-                        fmt = value
-                        try:
-                            fmt = value.format(**context)
-                        except KeyError as e:
-                            txt = f'LLM_template::format {self.file_name} has undefined variable {e}'
-                            self.last_error = txt
-                            return [{'error': txt}]
-                        ctx[key] = fmt
+            for key, value in item.items():
+                if key not in parts_by_key:
+                    ctx[key] = value
+                    continue
+                parts = parts_by_key[key]
+                try:
+                    if parts is None:
+                        ctx[key] = value.format(**context)
                     else:
-                        ctx[key] = value
-                result.append(ctx)
-            else:
-                assert False, 'The template_dict should be validate before, so it should not fail now'
+                        ctx[key] = ''.join([literal if field is None else literal + str(context[field]) for literal, field in parts])
+                except KeyError as e:
+                    txt = f'LLM_template::format {self.file_name} has undefined variable {e}'
+                    self.last_error = txt
+                    return [{'error': txt}]
+            result.append(ctx)
 
         return result
@@ -1,14 +1,26 @@
+import atexit
+import functools
 import os
 import time
 import datetime
+import hashlib
+import json
+import re
 import litellm
 import sys
+from collections import OrderedDict
 from typing import List, Dict
 
+import yaml
 from ruamel.yaml import YAML
-from ruamel.yaml.scalarstring import LiteralScalarString
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, json is used instead
+    orjson = None
 
 from hagent.core.llm_template import LLM_template
+from hagent.core.yaml_utils import YamlLoader, process_multiline_strings
 
 
 def dict_deep_merge(dict1: Dict, dict2: Dict) -> Dict:
@@ -32,23 +44,192 @@ def dict_deep_merge(dict1: Dict, dict2: Dict) -> Dict:
     return dict1
 
 
+# Model prefix -> environment variable holding the provider API key
+_PROVIDER_KEYS = {
+    'fireworks': 'FIREWORKS_AI_API_KEY',
+    'openai': 'OPENAI_API_KEY',
+    'anthropic': 'ANTHROPIC_API_KEY',
+    'replicate': 'REPLICATE_API_KEY',
+    'cohere': 'COHERE_API_KEY',
+    'together_ai': 'TOGETHER_AI_API_KEY',
+    'openrouter': 'OPENROUTER_API_KEY',
+    # Add more providers as needed...
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _required_env_key(model: str):
+    provider = model.split('/', 1)[0]
+    if provider in _PROVIDER_KEYS:
+        return _PROVIDER_KEYS[provider]
+    # e.g. 'fireworks_ai/...' or a model name without provider separator
+    return next((key for prefix, key in _PROVIDER_KEYS.items() if model.startswith(prefix)), None)
+
+
+def _compile_route(tier: Dict) -> Dict:
+    # llm.route entry: {tier: cheap, model: ..., max_words: 300, escalate: 'regex'}
+    escalate = tier.get('escalate')
+    return {
+        'tier': tier.get('tier', tier['model']),
+        'model': tier['model'],
+        'max_words': tier.get('max_words', float('inf')),
+        'escalate': re.compile(escalate, re.IGNORECASE) if escalate else None,
+    }
+
+
+_SUMMARY_PROMPT = (
+    'Summarize the following conversation in a few sentences. Keep every fact, decision and '
+    'piece of code that later messages may depend on.'
+)
+
+
+def _with_cache_control(messages: List[Dict]) -> List[Dict]:
+    # Anthropic prompt caching: mark the static system prompt as cacheable (ephemeral)
+    result = []
+    for m in messages:
+        if m.get('role') == 'system' and isinstance(m.get('content'), str):
+            content = [{'type': 'text', 'text': m['content'], 'cache_control': {'type': 'ephemeral'}}]
+            m = {**m, 'content': content}
+        result.append(m)
+    return result
+
+
+# A single configured YAML emitter for all log entries (constructing YAML() is expensive)
+_LOG_YAML = YAML()
+_LOG_YAML.indent(mapping=2, sequence=4, offset=2)
+
+# Log files with these suffixes are written as newline-delimited JSON instead of YAML
+_JSON_LOG_SUFFIXES = ('.ndjson', '.jsonl')
+
+
+def _dumps_json_line(entry: Dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(entry, default=str, ensure_ascii=False) + '\n'
+
+
+# Log files shared by all LLM_wrap instances writing to the same path, so their entries stay in order:
+# absolute path -> [append handle, number of instances using it]
+_log_handles: Dict[str, List] = {}
+
+
+def _acquire_log_handle(log_file: str):
+    key = os.path.abspath(log_file)
+    entry = _log_handles.get(key)
+    if entry is None or entry[0].closed:
+        entry = _log_handles[key] = [open(log_file, 'a', encoding='utf-8', buffering=1 << 16), 0]
+    entry[1] += 1
+    return entry[0]
+
+
+def _release_log_handle(log_file: str) -> None:
+    entry = _log_handles.get(os.path.abspath(log_file))
+    if entry is None:
+        return
+    entry[1] -= 1
+    if entry[1] <= 0:
+        del _log_handles[os.path.abspath(log_file)]
+        entry[0].close()
+
+
+@atexit.register
+def _close_log_handles():
+    for handle, _ in _log_handles.values():
+        handle.close()
+    _log_handles.clear()
+
+
+# Exact prompt cache shared by all LLM_wrap instances: request hash -> answers, least recently used first
+_PROMPT_CACHE_SIZE = 1024
+_prompt_cache: OrderedDict = OrderedDict()
+
+
+def _prompt_cache_get(key: str):
+    answers = _prompt_cache.get(key)
+    if answers is not None:
+        _prompt_cache.move_to_end(key)
+    return answers
+
+
+def _prompt_cache_put(key: str, answers: List[str]) -> None:
+    _prompt_cache[key] = list(answers)
+    _prompt_cache.move_to_end(key)
+    if len(_prompt_cache) > _PROMPT_CACHE_SIZE:
+        _prompt_cache.popitem(last=False)
+
+
+def _normalize_content(content):
+    # Only trailing whitespace is dropped: case and indentation matter for code prompts
+    if not isinstance(content, str):
+        return content
+    return '\n'.join(line.rstrip() for line in content.rstrip().splitlines())
+
+
+def _prompt_cache_key(llm_call_args: Dict) -> str:
+    """Returns a SHA-256 key for a litellm request that ignores trailing-whitespace differences."""
+    request = dict(llm_call_args)
+    request['messages'] = [{k: _normalize_content(v) for k, v in m.items()} for m in llm_call_args['messages']]
+    return hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+# Directory of the litellm disk cache installed by _init_litellm_cache
+_litellm_cache_dir = None
+_litellm_cache_ready = False
+
+
+def _init_litellm_cache(cache_dir=None):
+    # litellm.cache is process global: (re)create it only on first use or when the directory changes
+    global _litellm_cache_dir, _litellm_cache_ready
+    if _litellm_cache_ready and cache_dir == _litellm_cache_dir:
+        return
+    if cache_dir is None:
+        litellm.cache = litellm.Cache(type='disk')
+    else:
+        litellm.cache = litellm.Cache(type='disk', disk_cache_dir=cache_dir)
+    _litellm_cache_dir = cache_dir
+    _litellm_cache_ready = True
+
+
 class LLM_wrap:
+    __slots__ = (
+        'name',
+        'conf_file',
+        'log_file',
+        'last_error',
+        'chat_history',
+        'total_cost',
+        'total_tokens',
+        'total_time_ms',
+        'config',
+        'llm_args',
+        '_log_fh',
+        '_templates',
+        '_routes',
+        '_tier_by_model',
+        '_summary_failed',
+    )
+
+    # Shared litellm disk cache directory, None uses litellm's default (.litellm_cache)
+    cache_dir = None
+
     def load_config(self) -> Dict:
         if not os.path.exists(self.conf_file):
             self._set_error(f'unable to read conf_file: {self.conf_file}')
             return {}
 
         try:
-            yaml_loader = YAML(typ='safe')
             with open(self.conf_file, 'r', encoding='utf-8') as f:
-                conf_data = yaml_loader.load(f)
+                conf_data = yaml.load(f, Loader=YamlLoader)
 
             if not conf_data:
                 return {}
 
-            # Case-insensitive search for self.name
-            lower_name = self.name.lower()
-            config_name = next((k for k in conf_data if k.lower() == lower_name), None)
+            # Case-insensitive search for self.name (the first matching section wins)
+            lower_keys = {}
+            for k in conf_data:
+                if isinstance(k, str):
+                    lower_keys.setdefault(k.lower(), k)
+            config_name = lower_keys.get(self.name.lower())
             if not config_name:
                 return {}
 
@@ -61,22 +242,8 @@ class LLM_wrap:
         return {}
 
     def check_env_keys(self, model: str) -> bool:
-        if model.startswith('fireworks'):
-            required_key = 'FIREWORKS_AI_API_KEY'
-        elif model.startswith('openai'):
-            required_key = 'OPENAI_API_KEY'
-        elif model.startswith('anthropic'):
-            required_key = 'ANTHROPIC_API_KEY'
-        elif model.startswith('replicate'):
-            required_key = 'REPLICATE_API_KEY'
-        elif model.startswith('cohere'):
-            required_key = 'COHERE_API_KEY'
-        elif model.startswith('together_ai'):
-            required_key = 'TOGETHER_AI_API_KEY'
-        elif model.startswith('openrouter'):
-            required_key = 'OPENROUTER_API_KEY'
-        # Add more providers as needed...
-        else:
+        required_key = _required_env_key(model)
+        if required_key is None:
             # No specific key required for this model type (or you can raise an error if unknown)
             print(f'ERROR: No environment variable check defined for model: {model}', file=sys.stderr)
             return False
@@ -93,15 +260,20 @@ class LLM_wrap:
         self.name = name
         self.conf_file = conf_file
         self.log_file = log_file
+        self._log_fh = None  # shared append handle kept open across _log_event calls, released by close()
 
         self.last_error = ''
         self.chat_history = []  # Stores messages as [{"role": "...", "content": "..."}]
         self.total_cost = 0.0
         self.total_tokens = 0
         self.total_time_ms = 0.0
+        self._templates: Dict[str, LLM_template] = {}  # prompt_index -> validated template
+        self._routes: List[Dict] = []
+        self._tier_by_model: Dict[str, str] = {}
+        self._summary_failed = False  # set after a failed summary, so it is not retried on every call
 
-        # Initialize litellm cache
-        litellm.cache = litellm.Cache(type='disk')
+        # Initialize litellm cache (shared by all instances)
+        _init_litellm_cache(self.cache_dir)
 
         self.config = {}
 
@@ -118,24 +290,60 @@ class LLM_wrap:
             self._set_error(f'conf_file:{conf_file} or overwrite_conf must specify llm section')
             return
 
-        self.llm_args = self.config['llm']
+        # The optional llm.route tiers are handled here, everything else is passed to litellm
+        self.llm_args = {k: v for k, v in self.config['llm'].items() if k != 'route'}
+        try:
+            self._routes = [_compile_route(tier) for tier in self.config['llm'].get('route', [])]
+        except (TypeError, KeyError, re.error) as e:
+            self._set_error(f'conf_file:{conf_file} has an invalid llm route in section {name}: {e}')
+            return
+        self._tier_by_model = {route['model']: route['tier'] for route in self._routes}
 
         if 'model' not in self.llm_args:
             self._set_error(f'conf_file:{conf_file} must specify llm "model" in section {name}')
             return
 
+        if not self.llm_args['model'] or any(not route['model'] for route in self._routes):
+            self._set_error('empty model name. No default model used')
+            return
+
+        # Validate and compile the prompt templates up front, so inference only formats them.
+        # Invalid entries are left out and report their error when they are used.
+        for prompt_index, template_dict in self.config.items():
+            if prompt_index != 'llm' and isinstance(template_dict, list):
+                template = LLM_template(template_dict)
+                if not template.last_error:
+                    self._templates[prompt_index] = template
+
         try:
-            with open(self.log_file, 'a', encoding='utf-8'):
-                pass
+            self._log_handle()
         except Exception as e:
             self._set_error(f'creating/opening log file: {e}')
 
+    def _log_handle(self):
+        if self._log_fh is None or self._log_fh.closed:
+            self._log_fh = _acquire_log_handle(self.log_file)
+        return self._log_fh
+
+    def close(self):
+        """Releases the log file; it is closed once no LLM_wrap writing to it is open."""
+        if self._log_fh is not None:
+            self._log_fh = None
+            _release_log_handle(self.log_file)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _set_error(self, msg: str):
         self.last_error = msg
         print(msg, file=sys.stderr)
 
     def clear_history(self):
         self.chat_history.clear()
+        self._summary_failed = False
         data = {}
         data.update({'clear_history': True})
         if self.last_error:
@@ -143,27 +351,16 @@ class LLM_wrap:
         self._log_event(event_type=f'{self.name}:LLM_wrap.clear_history', data=data)
 
     def _log_event(self, event_type: str, data: Dict):
-        def process_multiline_strings(obj):
-            """
-            Recursively convert strings with newlines into LiteralScalarString so that they
-            are output in literal block style.
-            """
-            if isinstance(obj, dict):
-                return {k: process_multiline_strings(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [process_multiline_strings(item) for item in obj]
-            elif isinstance(obj, str) and '\n' in obj:
-                # Wrap the multiline string so that ruamel.yaml outputs it using literal block style.
-                return LiteralScalarString(obj)
-            return obj
-
         def append_log(dt, file):
-            # Process data to wrap multiline strings.
-            processed_data = process_multiline_strings(dt)
-            yaml = YAML()
-            # Configure indentation (optional).
-            yaml.indent(mapping=2, sequence=4, offset=2)
-            yaml.dump(processed_data, file)
+            if self.log_file.endswith(_JSON_LOG_SUFFIXES):
+                # One JSON object per line, multiline strings stay escaped inside the JSON string
+                file.write(_dumps_json_line(dt))
+            else:
+                # Process data to wrap multiline strings.
+                processed_data = process_multiline_strings(dt)
+                _LOG_YAML.dump(processed_data, file)
+            # One flush per entry keeps the log readable while the tool runs
+            file.flush()
 
         entry = {
             'timestamp': datetime.datetime.now(datetime.UTC).isoformat(),  # include microseconds
@@ -171,29 +368,33 @@ class LLM_wrap:
         }
         entry.update(data)
         try:
-            with open(self.log_file, 'a', encoding='utf-8') as lf:
-                append_log(entry, lf)
+            append_log(entry, self._log_handle())
         except Exception as e:
             self._set_error(f'unable to log: {e}')
 
-    def _call_llm(self, prompt_dict: Dict, prompt_index: str, n: int, max_history: int) -> List[str]:
-        if self.last_error:
-            return []
-
-        start_time = time.time()
+    def _prepare_call(self, prompt_dict: Dict, prompt_index: str, n: int, max_history: int):
+        """
+        Formats the prompt and builds the litellm.completion arguments.
 
+        Returns:
+            (formatted prompt, llm_call_args), or (None, None) after setting last_error.
+        """
         template_dict = self.config.get(prompt_index, {})
         if not template_dict:
             if not self.conf_file:
                 self._set_error(f'unable to find {prompt_index} entry in {self.config}')
             else:
                 self._set_error(f'unable to find {prompt_index} entry in {self.conf_file}')
-            return []
+            return None, None
 
-        template = LLM_template(template_dict)
-        if template.last_error:
-            self._set_error(f'template failed with {template.last_error}')
-            return []
+        # Reuse the validated template unless the config entry was replaced
+        template = self._templates.get(prompt_index)
+        if template is None or template.template_dict is not template_dict:
+            template = LLM_template(template_dict)
+            if template.last_error:
+                self._set_error(f'template failed with {template.last_error}')
+                return None, None
+            self._templates[prompt_index] = template
 
         # Format prompt
         try:
@@ -203,45 +404,109 @@ class LLM_wrap:
             self._set_error(f'template formatting error: {e}')
             data = {'error': self.last_error}
             self._log_event(event_type=f'{self.name}:LLM_wrap.error', data=data)
-            return []
+            return None, None
 
         # Check if template returned error
         if 'error' in formatted:
             self._set_error(f'template returned error: {formatted["error"]}')
             data = {'error': self.last_error}
             self._log_event(event_type=f'{self.name}:LLM_wrap.error', data=data)
-            return []
+            return None, None
 
         if max_history > 0:
+            summary_after_turns = self.config.get('summary_after_turns', 0)
+            if summary_after_turns and not self._summary_failed and len(self.chat_history) > summary_after_turns:
+                self._summarize_history(keep=summary_after_turns // 2)
             messages = self.chat_history[:max_history]
         else:
             messages = []
         messages += formatted
 
         # For inference, messages might just be what we got. For chat, this is final messages to send.
-        llm_call_args = {}
-        llm_call_args.update(self.llm_args)
-        llm_call_args['messages'] = messages
-        llm_call_args['n'] = n
+        llm_call_args = {**self.llm_args, 'messages': messages, 'n': n}
 
-        model = llm_call_args.get('model', '')
-        if model == '':
-            self._set_error('empty model name. No default model used')
-            return []
+        route = self._route(formatted)
+        if route is not None:
+            llm_call_args['model'] = route['model']
+        model = llm_call_args['model']
 
+        # Checked per call: Step.temporary_env_vars may only set the keys while running
         if not self.check_env_keys(model):
             self._set_error(f'environment keys not set for {model}')
-            return []
-
-        # Call litellm
+            return None, None
+
+        if model.startswith('anthropic'):
+            llm_call_args['messages'] = _with_cache_control(messages)
+
+        return formatted, llm_call_args
+
+    def _route(self, formatted: List[Dict]):
+        """
+        Picks the first llm.route tier that accepts the prompt: the last message must have at
+        most max_words words and must not match the tier escalate regex. None keeps llm.model.
+        """
+        if not self._routes:
+            return None
+        content = formatted[-1].get('content', '') if formatted else ''
+        if not isinstance(content, str):
+            return None
+        words = len(content.split())
+        for route in self._routes:
+            if words > route['max_words']:
+                continue
+            if route['escalate'] is not None and route['escalate'].search(content):
+                continue
+            return route
+        return None
+
+    def _summarize_history(self, keep: int):
+        """
+        Replaces all but the last `keep` chat_history entries with a single system message
+        summarizing them, generated by summary_model (llm.model when unset). On failure the history
+        is left unchanged and summaries stop until clear_history().
+        """
+        old = self.chat_history[: len(self.chat_history) - keep]
+        model = self.config.get('summary_model') or self.llm_args['model']
+        transcript = '\n\n'.join(f'{m.get("role", "")}: {m.get("content", "")}' for m in old)
+        summary_args = {
+            'model': model,
+            'messages': [
+                {'role': 'system', 'content': _SUMMARY_PROMPT},
+                {'role': 'user', 'content': transcript},
+            ],
+        }
         try:
-            r = litellm.completion(**llm_call_args)
+            # Same key check as check_env_keys, without setting last_error: a failed summary must not stop inference
+            required_key = _required_env_key(model)
+            if required_key is None or os.environ.get(required_key) is None:
+                raise ValueError(f'environment keys not set for {model}')
+            r = litellm.completion(**summary_args)
+            summary = r['choices'][0]['message']['content']
         except Exception as e:
-            self._set_error(f'litellm call error: {e}')
-            data = {'error': self.last_error}
-            self._log_event(event_type=f'{self.name}:LLM_wrap.error', data=data)
-            return []
+            self._summary_failed = True
+            self._log_event(event_type=f'{self.name}:LLM_wrap.summary', data={'error': f'summary failed: {e}'})
+            return
+
+        try:
+            cost = litellm.completion_cost(completion_response=r)
+        except Exception:
+            cost = 0.0  # Model may not be updated for cost
+        tokens = r.get('usage', {}).get('total_tokens', 0)
+        self.total_cost += cost
+        self.total_tokens += tokens
+
+        self.chat_history[: len(old)] = [{'role': 'system', 'content': f'Summary of the earlier conversation:\n{summary}'}]
+        data = {'model': model, 'cost': cost, 'tokens': tokens, 'summarized_turns': len(old), 'summary': summary}
+        self._log_event(event_type=f'{self.name}:LLM_wrap.summary', data=data)
 
+    def _cache_key(self, llm_call_args: Dict):
+        # Opt-in, and only for requests that set temperature 0: providers sample when it is unset
+        if self.config.get('prompt_cache', False) and llm_call_args.get('temperature') == 0:
+            return _prompt_cache_key(llm_call_args)
+        return None
+
+    def _parse_response(self, r, model: str):
+        """Extracts (answers, cost, tokens) from a litellm response."""
         answers = []
         cost = 0.0
         tokens = 0
@@ -266,19 +531,22 @@ class LLM_wrap:
         except Exception as e:
             self._set_error(f'parsing litellm response error: {e}')
 
-        time_ms = (time.time() - start_time) * 1000.0
+        return answers, cost, tokens
+
+    def _log_inference(self, event_type: str, model: str, cost: float, tokens: int, time_ms: float, formatted, answers, **extra):
         self.total_cost += cost
         self.total_tokens += tokens
         self.total_time_ms += time_ms
 
-        use_history = min(len(self.chat_history), max_history)
-        event_type = f'{self.name}:LLM_wrap.inference with history={use_history}'
+        if model in self._tier_by_model:
+            extra['tier'] = self._tier_by_model[model]
 
         data = {
             'model': model,
             'cost': cost,
             'tokens': tokens,
             'time_ms': time_ms,
+            **extra,
             'prompt': formatted,
             'answers': answers,
         }
@@ -287,8 +555,107 @@ class LLM_wrap:
             data['error'] = self.last_error
 
         self._log_event(event_type=event_type, data=data)
+
+    def _call_llm(self, prompt_dict: Dict, prompt_index: str, n: int, max_history: int) -> List[str]:
+        if self.last_error:
+            return []
+
+        start_time = time.time()
+
+        formatted, llm_call_args = self._prepare_call(prompt_dict, prompt_index, n, max_history)
+        if llm_call_args is None:
+            return []
+        model = llm_call_args['model']
+
+        use_history = min(len(self.chat_history), max_history)
+        event_type = f'{self.name}:LLM_wrap.inference with history={use_history}'
+
+        cache_key = self._cache_key(llm_call_args)
+        if cache_key is not None:
+            answers = _prompt_cache_get(cache_key)
+            if answers is not None:
+                time_ms = (time.time() - start_time) * 1000.0
+                self._log_inference(event_type, model, 0.0, 0, time_ms, formatted, answers, cache_hit=True)
+                return list(answers)
+
+        # Call litellm
+        try:
+            r = litellm.completion(**llm_call_args)
+        except Exception as e:
+            self._set_error(f'litellm call error: {e}')
+            data = {'error': self.last_error}
+            self._log_event(event_type=f'{self.name}:LLM_wrap.error', data=data)
+            return []
+
+        answers, cost, tokens = self._parse_response(r, model)
+
+        if cache_key is not None and answers and not self.last_error:
+            _prompt_cache_put(cache_key, answers)
+
+        time_ms = (time.time() - start_time) * 1000.0
+        self._log_inference(event_type, model, cost, tokens, time_ms, formatted, answers)
         return answers
 
     def inference(self, prompt_dict: Dict, prompt_index: str, n: int = 1, max_history: int = 0) -> List[str]:
         answers = self._call_llm(prompt_dict, prompt_index, n=n, max_history=max_history)
         return answers
+
+    def inference_batch(
+        self, prompt_dicts: List[Dict], prompt_index: str, n: int = 1, max_history: int = 0
+    ) -> List[List[str]]:
+        """
+        Same as calling inference for each prompt_dict, but all the requests that miss the
+        prompt cache are sent together with a single litellm.batch_completion.
+
+        Returns:
+            One list of answers per prompt_dict (empty on error, see last_error).
+        """
+        if self.last_error:
+            return [[] for _ in prompt_dicts]
+
+        use_history = min(len(self.chat_history), max_history)
+        event_type = f'{self.name}:LLM_wrap.inference_batch with history={use_history}'
+
+        results: List[List[str]] = [[] for _ in prompt_dicts]
+        # Requests only differ in messages, except for the model picked by routing
+        pending: Dict[str, List] = {}  # model -> [(index, formatted, cache_key, messages)]
+        batch_args: Dict[str, Dict] = {}  # model -> litellm arguments without messages
+        for index, prompt_dict in enumerate(prompt_dicts):
+            formatted, call_args = self._prepare_call(prompt_dict, prompt_index, n, max_history)
+            if call_args is None:
+                return results
+            cache_key = self._cache_key(call_args)
+            answers = _prompt_cache_get(cache_key) if cache_key is not None else None
+            if answers is not None:
+                results[index] = list(answers)
+                self._log_inference(event_type, call_args['model'], 0.0, 0, 0.0, formatted, answers, cache_hit=True)
+            else:
+                model = call_args['model']
+                pending.setdefault(model, []).append((index, formatted, cache_key, call_args.pop('messages')))
+                batch_args[model] = call_args
+
+        for model, requests in pending.items():
+            batch_start = time.time()
+            try:
+                responses = litellm.batch_completion(messages=[p[3] for p in requests], **batch_args[model])
+            except Exception as e:
+                self._set_error(f'litellm call error: {e}')
+                data = {'error': self.last_error}
+                self._log_event(event_type=f'{self.name}:LLM_wrap.error', data=data)
+                return results
+
+            # The batch wall time is split evenly between its requests
+            time_ms = (time.time() - batch_start) * 1000.0 / len(requests)
+            for (index, formatted, cache_key, _), r in zip(requests, responses):
+                if isinstance(r, Exception):
+                    self._set_error(f'litellm call error: {r}')
+                    data = {'error': self.last_error}
+                    self._log_event(event_type=f'{self.name}:LLM_wrap.error', data=data)
+                    continue
+                answers, cost, tokens = self._parse_response(r, model)
+                if cache_key is not None and answers and not self.last_error:
+                    _prompt_cache_put(cache_key, answers)
+                results[index] = answers
+                self._log_inference(event_type, model, cost, tokens, time_ms, formatted, answers)
+
+        return results
@@ -1,26 +1,44 @@
 # hagent/tool/react.py
 
-from typing import Optional, Callable, List, Dict, Tuple
+from typing import Optional, Callable, List, Dict, Sequence, Tuple, Union
+import functools
 import os
-from ruamel.yaml import YAML
-from ruamel.yaml.scalarstring import LiteralScalarString
+import re
+import sqlite3
+import yaml
+from contextlib import closing
 
+from hagent.core.yaml_utils import LiteralDumper, YamlLoader, process_multiline_strings  # noqa: F401
 from hagent.tool.compile import Diagnostic
 
 
-def process_multiline_strings(obj):
+# Every SQLite database file starts with this header
+_SQLITE_HEADER = b'SQLite format 3\x00'
+_SQLITE_CREATE = 'CREATE TABLE IF NOT EXISTS fixes (error_type TEXT PRIMARY KEY, fix_question TEXT, fix_answer TEXT)'
+
+
+# Line boundaries recognized by str.splitlines other than '\n' (a '\r\n' pair splits at its '\n')
+_OTHER_LINE_BREAKS = re.compile('\r(?!\n)|[\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def _line_offset(code: str, n: int) -> int:
     """
-    Recursively converts strings containing newlines into a LiteralScalarString
-    so that ruamel.yaml outputs them in literal block style.
+    Returns the offset right after the n-th '\n' in code, i.e. where line n+1 starts,
+    or len(code) if the code has fewer lines.
     """
-    if isinstance(obj, dict):
-        return {k: process_multiline_strings(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [process_multiline_strings(item) for item in obj]
-    elif isinstance(obj, str) and '\n' in obj:
-        # Wrap the string to enforce literal block style.
-        return LiteralScalarString(obj)
-    return obj
+    pos = 0
+    for _ in range(n):
+        pos = code.find('\n', pos)
+        if pos < 0:
+            return len(code)
+        pos += 1
+    return pos
+
+
+@functools.lru_cache(maxsize=128)
+def _format_comment_block(add: str, prefix: str) -> str:
+    # The same diagnostic is often inserted again in later React iterations
+    return ''.join([f'{prefix} {line.rstrip()}\n' for line in add.splitlines()])
 
 
 def insert_comment(code: str, add: str, prefix: str, loc: int) -> str:
@@ -36,15 +54,30 @@ def insert_comment(code: str, add: str, prefix: str, loc: int) -> str:
     Returns:
         The modified string of code with the comment inserted.
     """
-    code_lines = code.splitlines(keepends=True)
-    add_lines = add.splitlines()
-    if loc < 1 or loc > len(code_lines) + 1:
-        raise ValueError('Invalid line number (loc)')
     # Create commented lines
-    commented_add_lines = [f'{prefix} {line.rstrip()}\n' for line in add_lines]
+    commented = _format_comment_block(add, prefix)
+    if _OTHER_LINE_BREAKS.search(code):
+        code_lines = code.splitlines(keepends=True)
+        if loc < 1 or loc > len(code_lines) + 1:
+            raise ValueError('Invalid line number (loc)')
+        code_lines.insert(loc - 1, commented)
+        return ''.join(code_lines)
+
+    if loc < 1:
+        raise ValueError('Invalid line number (loc)')
+    # Find where line loc starts, only scanning the code up to it
+    offset = 0
+    for i in range(loc - 1):
+        pos = code.find('\n', offset)
+        if pos < 0:
+            # Only allowed right after a last line without a trailing newline
+            if i == loc - 2 and offset < len(code):
+                offset = len(code)
+                break
+            raise ValueError('Invalid line number (loc)')
+        offset = pos + 1
     # Insert commented lines at the specified location
-    code_lines[loc - 1 : loc - 1] = commented_add_lines
-    return ''.join(code_lines)
+    return code[:offset] + commented + code[offset:]
 
 
 class React:
@@ -53,12 +86,26 @@ class React:
     Orchestrates iterative error fixing by invoking user-supplied check and fix callbacks.
     """
 
+    __slots__ = (
+        'error_message',
+        '_is_ready',
+        '_db_path',
+        '_db',
+        '_db_dirty',
+        '_learn_mode',
+        '_max_iterations',
+        'last_code',
+        '_log',
+        '_lang_prefix',
+    )
+
     def __init__(self):
         # Initialize internal state
         self.error_message: str = ''
         self._is_ready: bool = False
         self._db_path: Optional[str] = None
         self._db: Dict[str, Dict[str, str]] = {}  # Mapping: error type -> sample fix
+        self._db_dirty: bool = False  # _db has examples not yet written by flush()
         self._learn_mode: bool = False
         self._max_iterations: int = 5
         self.last_code: str = ''
@@ -78,11 +125,12 @@ class React:
         Returns:
             True if setup is successful, False otherwise (and sets error_message).
         """
+        # Write pending examples before the DB is replaced
+        self.flush()
         self.last_code = ''
         self._log.clear()
         self._learn_mode = learn
-        self._max_iterations = max_iterations
-        self._lang_prefix = comment_prefix
+        self.configure(max_iterations, comment_prefix)
         self._db_path = db_path
 
         if self._db_path:
@@ -112,17 +160,42 @@ class React:
         self._is_ready = True
         return True
 
+    def configure(self, max_iterations: int = 5, comment_prefix: str = '//') -> None:
+        """
+        Changes the iteration limit and comment prefix without reloading the DB, as setup does.
+        """
+        self._max_iterations = max_iterations
+        self._lang_prefix = comment_prefix
+
+    def _uses_sqlite(self) -> bool:
+        # An existing file keeps its format, whatever its name. The suffix only picks the format of a
+        # new (or empty) file: SQLite for .db/.sqlite/.sqlite3, YAML otherwise.
+        try:
+            with open(self._db_path, 'rb') as f:
+                header = f.read(len(_SQLITE_HEADER))
+        except OSError:
+            header = b''
+        if header:
+            return header == _SQLITE_HEADER
+        return self._db_path.endswith(('.db', '.sqlite', '.sqlite3'))
+
     def _load_db(self) -> None:
         """
-        Reads the YAML database file from `_db_path` into `_db`.
+        Reads the database file from `_db_path` into `_db`.
         """
         if not os.path.exists(self._db_path):
             self._db = {}
             return
 
-        yaml_loader = YAML(typ='safe')
+        if self._uses_sqlite():
+            with closing(sqlite3.connect(self._db_path)) as conn:
+                conn.execute(_SQLITE_CREATE)
+                rows = conn.execute('SELECT error_type, fix_question, fix_answer FROM fixes').fetchall()
+            self._db = {error_type: {'fix_question': q, 'fix_answer': a} for error_type, q, a in rows}
+            return
+
         with open(self._db_path, 'r', encoding='utf-8') as f:
-            data = yaml_loader.load(f)
+            data = yaml.load(f, Loader=YamlLoader)
             if data is None:
                 data = {}
             # Ensure the data is a mapping.
@@ -131,37 +204,53 @@ class React:
 
     def _save_db(self) -> None:
         """
-        Writes `_db` back to disk (only if learn mode is enabled) using
-        literal block style for multiline strings.
+        Writes `_db` back to disk (only if learn mode is enabled). YAML databases
+        use literal block style for multiline strings.
         """
-        if self._learn_mode and self._db_path:
-            yaml_writer = YAML()
-            # Configure indentation for better readability.
-            yaml_writer.indent(mapping=2, sequence=4, offset=2)
-            # Process _db to wrap multiline strings.
-            processed_db = process_multiline_strings(self._db)
+        if self._learn_mode and self._db_path and self._uses_sqlite():
+            self._insert_fixes(self._db)
+        elif self._learn_mode and self._db_path:
             with open(self._db_path, 'w', encoding='utf-8') as f:
-                yaml_writer.dump(processed_db, f)
+                yaml.dump(self._db, f, Dumper=LiteralDumper, default_flow_style=False, sort_keys=False, allow_unicode=True)
 
     def _add_error_example(self, error_type: str, fix_question: str, fix_answer: str) -> None:
         """
         Updates `_db` with a new error example if not already present.
-        Immediately saves if learning mode is enabled.
+        If learning mode is enabled, the example is written by the next flush().
         """
         if error_type not in self._db:
             self._db[error_type] = {'fix_question': fix_question, 'fix_answer': fix_answer}
             if self._learn_mode:
-                self._save_db()
+                self._db_dirty = True
 
-    def _get_delta(self, code: str, loc: int, window: int = 5) -> Tuple[str, int, int]:
+    def flush(self) -> None:
+        """
+        Writes the examples learned since the last flush to disk. react_cycle calls it
+        when it returns, and setup before loading a new DB.
+        """
+        if self._db_dirty:
+            self._save_db()
+            self._db_dirty = False
+
+    def _insert_fixes(self, fixes: Dict[str, Dict[str, str]]) -> None:
+        rows = [(error_type, fix['fix_question'], fix['fix_answer']) for error_type, fix in fixes.items()]
+        with closing(sqlite3.connect(self._db_path)) as conn:
+            with conn:  # commits the transaction
+                conn.execute(_SQLITE_CREATE)
+                conn.executemany('INSERT OR IGNORE INTO fixes VALUES (?, ?, ?)', rows)
+
+    def _get_delta(self, code: Union[str, Sequence[str]], loc: int, window: int = 5) -> Tuple[str, int, int]:
         """
         Extracts a delta (subset of code lines) around a specified location.
 
+        Args:
+            code: The full code, or its lines as split by str.splitlines(keepends=True).
+
         Returns:
             A tuple of (delta code, start line, end line) where start_line and end_line
             are 1-indexed boundaries within the full code.
         """
-        lines = code.splitlines(keepends=True)
+        lines = code.splitlines(keepends=True) if isinstance(code, str) else code
         total = len(lines)
         start_line = max(1, loc - window)
         end_line = min(total, loc + window)
@@ -172,10 +261,12 @@ class React:
         """
         Applies a patch (delta) to the full code, replacing lines from start_line to end_line.
         """
-        full_lines = full_code.splitlines(keepends=True)
-        patch_lines = patch.splitlines(keepends=True)
-        new_lines = full_lines[: start_line - 1] + patch_lines + full_lines[end_line:]
-        return ''.join(new_lines)
+        if _OTHER_LINE_BREAKS.search(full_code):
+            full_lines = full_code.splitlines(keepends=True)
+            return ''.join(full_lines[: start_line - 1]) + patch + ''.join(full_lines[end_line:])
+        start = _line_offset(full_code, start_line - 1)
+        end = _line_offset(full_code, end_line)
+        return full_code[:start] + patch + full_code[end:]
 
     def react_cycle(
         self,
@@ -201,12 +292,29 @@ class React:
             self.error_message = 'React tool is not ready. Please run setup first.'
             return ''
 
+        try:
+            return self._run_cycle(initial_text, check_callback, fix_callback)
+        finally:
+            # Learned examples are written once per cycle instead of once per example
+            self.flush()
+
+    def _run_cycle(
+        self,
+        initial_text: str,
+        check_callback: Callable[[str], List[Diagnostic]],
+        fix_callback: Callable[[str, Diagnostic, Dict[str, str], bool, int], str],
+    ) -> str:
         current_text = initial_text
         self.last_code = initial_text
+        # Diagnostics of the previous post-fix check, which was run on the current_text
+        known_diagnostics: Optional[List[Diagnostic]] = None
 
         for iteration in range(1, self._max_iterations + 1):
             iteration_log: Dict = {'iteration': iteration, 'check': None, 'fix': None}
-            diagnostics = check_callback(current_text)
+            if known_diagnostics is not None:
+                diagnostics = known_diagnostics
+            else:
+                diagnostics = check_callback(current_text)
             # Log all diagnostic details.
             iteration_log['check'] = [{'msg': d.msg, 'loc': d.loc, 'hint': getattr(d, 'hint', '')} for d in diagnostics]
 
@@ -265,6 +373,7 @@ class React:
                 if new_error_type != error_type and self._learn_mode:
                     self._add_error_example(error_type, fix_question, fix_answer)
                 current_text = new_text
+                known_diagnostics = new_diagnostics
 
         self.last_code = current_text
         return ''
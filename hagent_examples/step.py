@@ -2,15 +2,37 @@
 # See LICENSE for details
 
 import sys
-import datetime
+import copy
+from datetime import datetime
+import functools
+import json
 import os
 import contextlib
 
-from ruamel.yaml import YAML
+import yaml
 from ruamel.yaml.scalarstring import LiteralScalarString
 
 from hagent.core.llm_wrap import dict_deep_merge
 from hagent.core.llm_wrap import LLM_wrap
+from hagent.core.yaml_utils import LiteralDumper, YamlLoader
+
+
+@functools.lru_cache(maxsize=128)
+def _load_yaml_file(path: str, mtime_ns: int, size: int):
+    # mtime_ns and size are only part of the cache key, so an edited file is parsed again.
+    # libyaml reads and decodes the binary stream itself, without a Python-level str copy of the file.
+    with open(path, 'rb', buffering=1 << 16) as f:
+        return yaml.load(f, Loader=YamlLoader)
+
+
+def _error_stamp() -> str:
+    # Program name and time prefix of every error message written by a Step
+    return f'{sys.argv[0]} {datetime.now().isoformat()}'
+
+
+def _is_plain_ascii(text: str) -> bool:
+    # Printable ASCII plus tab and newline, which json.dumps escapes the same way YAML does
+    return all(' ' <= ch <= '~' or ch in '\t\n' for ch in text)
 
 
 def wrap_literals(obj):
@@ -42,22 +64,17 @@ class Step:
         self.input_file = None
         self.output_file = None
 
-        args = sys.argv[1:]
-        i = 0
-        while i < len(args):
-            if args[i].startswith('-o'):
-                if args[i] == '-o':
-                    i += 1
-                    if i < len(args):
-                        self.output_file = args[i]
-                    else:
-                        print('Error: Missing output file after -o')
-                        sys.exit(1)
-                else:
-                    self.output_file = args[i][2:]
-            elif not args[i].startswith('-'):
-                self.input_file = args[i]
-            i += 1
+        args = iter(sys.argv[1:])
+        for arg in args:
+            if arg == '-o':
+                self.output_file = next(args, None)
+                if self.output_file is None:
+                    print('Error: Missing output file after -o')
+                    sys.exit(1)
+            elif arg.startswith('-o'):
+                self.output_file = arg[2:]
+            elif not arg.startswith('-'):
+                self.input_file = arg
 
         if self.output_file is None or self.input_file is None:
             program_name = sys.argv[0]
@@ -65,25 +82,35 @@ class Step:
             sys.exit(1)
 
     def read_input(self):
-        # Read input using ruamel.yaml for improved formatting.
+        # Read input using libyaml when available.
         if self.input_file is None:
-            return {'error': f'{sys.argv[0]} {datetime.datetime.now().isoformat()} - unset input_file (missing setup?):'}
+            return {'error': f'{_error_stamp()} - unset input_file (missing setup?):'}
         try:
-            yaml_obj = YAML(typ='safe')
-            with open(self.input_file, 'r') as f:
-                data = yaml_obj.load(f)
+            st = os.stat(self.input_file)
+            # Callers mutate input_data, so hand out a copy of the cached parse.
+            data = copy.deepcopy(_load_yaml_file(os.path.abspath(self.input_file), st.st_mtime_ns, st.st_size))
         except Exception as e:
-            return {'error': f'{sys.argv[0]} {datetime.datetime.now().isoformat()} - Error loading input file: {e}'}
+            return {'error': f'{_error_stamp()} - Error loading input file: {e}'}
 
         return data
 
     def write_output(self, data):
-        # Write output using ruamel.yaml with wrapped literals.
-        yaml_obj = YAML()
-        yaml_obj.default_flow_style = False
-        processed_data = wrap_literals(data)
-        with open(self.output_file, 'w') as f:
-            yaml_obj.dump(processed_data, f)
+        # Write output using libyaml when available, with multiline strings as literal blocks.
+        # The emitter encodes to UTF-8 itself, and the 1 MiB buffer keeps large code dumps to a few writes.
+        with open(self.output_file, 'wb', buffering=1 << 20) as f:
+            yaml.dump(
+                data, f, Dumper=LiteralDumper, default_flow_style=False, sort_keys=False, allow_unicode=True, encoding='utf-8'
+            )
+
+    def _write_error_output(self, data):
+        # Propagated errors are usually a flat map of printable ASCII strings. Those JSON strings
+        # are valid YAML double-quoted scalars, so they are written without the YAML emitter.
+        # Anything else (DEL, C1 controls, U+0085, non-ASCII) goes through the emitter.
+        if not all(type(k) is str and type(v) is str and _is_plain_ascii(k) and _is_plain_ascii(v) for k, v in data.items()):
+            self.write_output(data)
+            return
+        with open(self.output_file, 'w', encoding='utf-8') as f:
+            f.write(''.join(f'{json.dumps(k)}: {json.dumps(v)}\n' for k, v in data.items()))
 
     @contextlib.contextmanager
     def temporary_env_vars(self):
@@ -97,18 +124,17 @@ class Step:
         """
         env_vars = self.input_data.get('set_env_vars', {})
 
-        original_env = {}
+        env = os.environ
+        original_env = {key: env.get(key) for key in env_vars}
         try:
-            for key, value in env_vars.items():
-                original_env[key] = os.environ.get(key)
-                os.environ[key] = value  # Set temporary environment variable
+            env.update(env_vars)  # Set temporary environment variables
             yield
         finally:
-            for key in env_vars.keys():
-                if original_env.get(key) is None:
-                    os.environ.pop(key, None)  # Unset if it did not exist originally
+            for key, value in original_env.items():
+                if value is None:
+                    env.pop(key, None)  # Unset if it did not exist originally
                 else:
-                    os.environ[key] = original_env[key]  # Restore original value
+                    env[key] = value  # Restore original value
 
     def setup(self):
         self.setup_called = True
@@ -125,7 +151,7 @@ class Step:
             if isinstance(self.input_data, dict) and 'error' in self.input_data:
                 # Propagate error from input reading and exit
                 print('WARNING: error field in input yaml, just propagating')
-                self.write_output(self.input_data)
+                self._write_error_output(self.input_data)
                 sys.exit(4)
             if self.overwrite_conf:
                 self.input_data = dict_deep_merge(self.input_data, self.overwrite_conf)
@@ -138,13 +164,11 @@ class Step:
 
     def test(self, exp_file):
         # Unit test that compares run output against an expected YAML file.
-        yaml_obj = YAML(typ='safe')
-        with open(exp_file, 'r') as f:
-            expected_output = yaml_obj.load(f)
+        with open(exp_file, 'rb', buffering=1 << 16) as f:
+            expected_output = yaml.load(f, Loader=YamlLoader)
         assert expected_output is not None
         assert expected_output != {}
 
-        self.input_data = self.read_input()
         self.setup()
         with self.temporary_env_vars():
             result_data = self.run(self.input_data)
@@ -156,8 +180,7 @@ class Step:
 
     def error(self, msg: str):
         # Write error details to output and raise an exception.
-        output_data = self.input_data.copy() if self.input_data else {}
-        output_data.update({'error': f'{sys.argv[0]} {datetime.datetime.now().isoformat()} {msg}'})
+        output_data = {**(self.input_data or {}), 'error': f'{_error_stamp()} {msg}'}
         print(f'ERROR: {sys.argv[0]} : {msg}')
         self.write_output(output_data)
         raise ValueError(msg)
@@ -175,28 +198,19 @@ class Step:
             # Propagate all fields from input to output unless overridden.
             output_data.update(result_data)
         except Exception as e:
-            output_data.update({'error': f'{sys.argv[0]} {datetime.datetime.now().isoformat()} - unable to write yaml: {e}'})
+            output_data.update({'error': f'{_error_stamp()} - unable to write yaml: {e}'})
             print(f'ERROR: unable to write yaml: {e}')
 
-        # Get total cost and tokens if there is any LLM attached
-        cost = 0.0
-        tokens = 0
-        for attr_name in dir(self):
-            try:
-                attr_value = getattr(self, attr_name)
-                if isinstance(attr_value, LLM_wrap):
-                    cost += attr_value.total_cost
-                    tokens += attr_value.total_tokens
-            except AttributeError:
-                # Skip attributes that can't be accessed
-                pass
-        if cost > 0:
-            cost += output_data.get('cost', 0.0)
-            output_data['cost'] = cost
-
-        if tokens > 0:
-            tokens += output_data.get('tokens', 0)
-            output_data['tokens'] = tokens
+        # Get total cost and tokens if there is any LLM attached; instance attributes are enough, unlike dir(self)
+        llm_wraps = [value for value in vars(self).values() if type(value) is LLM_wrap or isinstance(value, LLM_wrap)]
+        if llm_wraps:
+            cost = sum(llm.total_cost for llm in llm_wraps)
+            tokens = sum(llm.total_tokens for llm in llm_wraps)
+            if cost > 0:
+                output_data['cost'] = output_data.get('cost', 0.0) + cost
+
+            if tokens > 0:
+                output_data['tokens'] = output_data.get('tokens', 0) + tokens
 
         self.write_output(output_data)
         return output_data
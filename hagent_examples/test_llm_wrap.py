@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test file for LLM_wrap, with litellm mocked out.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+import hagent.core.llm_wrap as llm_wrap_module
+from hagent.core.llm_wrap import LLM_wrap
+
+
+def _response(*answers, tokens=10):
+    return {'choices': [{'message': {'content': answer}} for answer in answers], 'usage': {'total_tokens': tokens}}
+
+
+@pytest.fixture
+def litellm_mock(monkeypatch):
+    """litellm.completion/batch_completion stand-ins, fresh for each test."""
+    mock = MagicMock()
+    mock.completion.return_value = _response('answer')
+    mock.completion_cost.return_value = 0.0
+    monkeypatch.setattr(llm_wrap_module.litellm, 'completion', mock.completion)
+    monkeypatch.setattr(llm_wrap_module.litellm, 'batch_completion', mock.batch_completion)
+    monkeypatch.setattr(llm_wrap_module.litellm, 'completion_cost', mock.completion_cost)
+    monkeypatch.setattr(llm_wrap_module, '_init_litellm_cache', lambda cache_dir=None: None)
+    monkeypatch.setattr(llm_wrap_module, '_prompt_cache', llm_wrap_module.OrderedDict())
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+    return mock
+
+
+@pytest.fixture
+def make_wrap(tmp_path, litellm_mock):
+    wraps = []
+
+    def make(log_name='llm.log', **conf):
+        config = {
+            'llm': {'model': 'openai/gpt-4o'},
+            'prompt': [{'role': 'system', 'content': 'be brief'}, {'role': 'user', 'content': '{question}'}],
+        }
+        config.update(conf)
+        wrap = LLM_wrap(name='test', conf_file='', log_file=str(tmp_path / log_name), overwrite_conf=config)
+        assert wrap.last_error == ''
+        wraps.append(wrap)
+        return wrap
+
+    yield make
+    for wrap in wraps:
+        wrap.close()
+
+
+def _fill_history(wrap, turns):
+    wrap.chat_history.extend({'role': 'user', 'content': f'turn {i}'} for i in range(turns))
+
+
+def test_summary_defaults_to_configured_model(make_wrap, litellm_mock):
+    wrap = make_wrap(summary_after_turns=4)
+    _fill_history(wrap, 6)
+    litellm_mock.completion.return_value = _response('short summary')
+
+    wrap._prepare_call({'question': 'hi'}, 'prompt', 1, max_history=10)
+
+    assert litellm_mock.completion.call_args.kwargs['model'] == 'openai/gpt-4o'
+    assert len(wrap.chat_history) == 3
+    assert wrap.chat_history[0]['content'].endswith('short summary')
+
+
+def test_summary_without_env_key_is_not_retried(make_wrap, litellm_mock, monkeypatch):
+    wrap = make_wrap(summary_after_turns=4, summary_model='anthropic/claude-3-haiku')
+    monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+    _fill_history(wrap, 6)
+
+    wrap._prepare_call({'question': 'hi'}, 'prompt', 1, max_history=10)
+
+    litellm_mock.completion.assert_not_called()
+    assert len(wrap.chat_history) == 6
+    assert wrap.last_error == ''
+
+
+def test_failed_summary_is_not_retried(make_wrap, litellm_mock):
+    wrap = make_wrap(summary_after_turns=4)
+    _fill_history(wrap, 6)
+    litellm_mock.completion.side_effect = RuntimeError('rate limited')
+
+    wrap._prepare_call({'question': 'hi'}, 'prompt', 1, max_history=10)
+    wrap._prepare_call({'question': 'again'}, 'prompt', 1, max_history=10)
+
+    assert litellm_mock.completion.call_count == 1
+    assert len(wrap.chat_history) == 6
+
+
+ROUTE = [
+    {'tier': 'cheap', 'model': 'openai/gpt-4o-mini', 'max_words': 3, 'escalate': 'prove'},
+    {'tier': 'strong', 'model': 'openai/gpt-4o'},
+]
+
+
+def _batch_answers(messages, **kwargs):
+    return [_response(f'{kwargs["model"]}: {m[-1]["content"]}') for m in messages]
+
+
+def test_inference_batch_groups_requests_by_routed_model(make_wrap, litellm_mock):
+    wrap = make_wrap(llm={'model': 'openai/gpt-4o', 'route': ROUTE})
+    litellm_mock.batch_completion.side_effect = _batch_answers
+    questions = ['short one', 'a much longer question here', 'tiny', 'please prove it']
+
+    results = wrap.inference_batch([{'question': q} for q in questions], 'prompt')
+
+    assert litellm_mock.batch_completion.call_count == 2
+    sizes = {call.kwargs['model']: len(call.kwargs['messages']) for call in litellm_mock.batch_completion.call_args_list}
+    assert sizes == {'openai/gpt-4o-mini': 2, 'openai/gpt-4o': 2}
+    assert results == [
+        ['openai/gpt-4o-mini: short one'],
+        ['openai/gpt-4o: a much longer question here'],
+        ['openai/gpt-4o-mini: tiny'],
+        ['openai/gpt-4o: please prove it'],
+    ]
+
+
+@pytest.mark.parametrize(
+    'question, model',
+    [
+        ('two words', 'openai/gpt-4o-mini'),
+        ('four words are here', 'openai/gpt-4o'),
+        ('Prove this', 'openai/gpt-4o'),
+    ],
+)
+def test_route_by_max_words_and_escalate(make_wrap, litellm_mock, question, model):
+    wrap = make_wrap(llm={'model': 'openai/gpt-4o', 'route': ROUTE})
+
+    wrap.inference({'question': question}, 'prompt')
+
+    assert litellm_mock.completion.call_args.kwargs['model'] == model
+
+
+def test_inference_batch_keeps_other_results_on_item_exception(make_wrap, litellm_mock):
+    wrap = make_wrap()
+    litellm_mock.batch_completion.return_value = [_response('first'), RuntimeError('timeout'), _response('third')]
+
+    results = wrap.inference_batch([{'question': q} for q in ('a', 'b', 'c')], 'prompt')
+
+    assert results == [['first'], [], ['third']]
+    assert 'timeout' in wrap.last_error
+
+
+@pytest.mark.parametrize(
+    'prompt_cache, temperature, calls',
+    [
+        (True, 0, 1),
+        (True, None, 2),
+        (True, 0.7, 2),
+        (False, 0, 2),
+    ],
+)
+def test_prompt_cache_only_for_opt_in_at_temperature_zero(make_wrap, litellm_mock, prompt_cache, temperature, calls):
+    llm = {'model': 'openai/gpt-4o'}
+    if temperature is not None:
+        llm['temperature'] = temperature
+    wrap = make_wrap(llm=llm, prompt_cache=prompt_cache)
+
+    first = wrap.inference({'question': 'same'}, 'prompt')
+    second = wrap.inference({'question': 'same  '}, 'prompt')
+
+    assert first == second == ['answer']
+    assert litellm_mock.completion.call_count == calls
+
+
+def test_inference_batch_uses_prompt_cache(make_wrap, litellm_mock):
+    wrap = make_wrap(llm={'model': 'openai/gpt-4o', 'temperature': 0}, prompt_cache=True)
+    litellm_mock.completion.return_value = _response('cached')
+    litellm_mock.batch_completion.side_effect = _batch_answers
+    wrap.inference({'question': 'seen'}, 'prompt')
+
+    results = wrap.inference_batch([{'question': 'new'}, {'question': 'seen'}], 'prompt')
+
+    assert results == [['openai/gpt-4o: new'], ['cached']]
+    assert len(litellm_mock.batch_completion.call_args.kwargs['messages']) == 1
+
+
+def test_close_releases_shared_log_handle(make_wrap):
+    first = make_wrap()
+    second = make_wrap()
+    handle = first._log_handle()
+    assert second._log_handle() is handle
+
+    first.close()
+    assert not handle.closed
+    second.close()
+
+    assert handle.closed
+    assert not llm_wrap_module._log_handles
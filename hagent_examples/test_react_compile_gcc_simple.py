@@ -121,7 +121,7 @@ def fix_callback_cpp(current_code: str, diag: Diagnostic, fix_example: dict, del
         # Use the name that exists in the config file
         lw = LLM_wrap(
             name='test_react_compile_slang_simple', 
-            log_file='test_react_compile_gcc_simple.log', 
+            log_file='test_react_compile_gcc_simple.ndjson', 
             conf_file=conf_file
         )
         
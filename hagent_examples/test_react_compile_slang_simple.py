@@ -18,6 +18,9 @@ from hagent.core.llm_wrap import LLM_wrap
 from hagent.tool.compile import Diagnostic
 from hagent.tool.extract_code import Extract_code_verilog
 
+# Number of compiled code snippets whose diagnostics are remembered by React_compile_slang
+_DIAG_CACHE_SIZE = 256
+
 
 class React_compile_slang:
     """
@@ -29,24 +32,34 @@ class React_compile_slang:
         conf_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'llm_wrap_conf1.yaml')
         # Initialize LLM_wrap instance using configuration from file.
         self.llm = LLM_wrap(
-            name='test_react_compile_slang_simple', log_file='test_react_compile_slang_simple.log', conf_file=conf_file
+            name='test_react_compile_slang_simple', log_file='test_react_compile_slang_simple.ndjson', conf_file=conf_file
         )
         assert not self.llm.last_error
 
         self.compiler = Compile_slang()
         self.extractor = Extract_code_verilog()
+        # code -> diagnostics, evicted in insertion order once _DIAG_CACHE_SIZE is reached
+        self._diag_cache: Dict[str, List[Diagnostic]] = {}
 
     def check_callback(self, code: str) -> List[Diagnostic]:
         """
         Checks whether the provided Verilog code compiles.
         Calls setup on the compiler to reset its state.
         Returns a list of Diagnostic objects if errors are found.
+        Results are memoized per code, since LLM candidates often repeat.
         """
+        cached = self._diag_cache.get(code)
+        if cached is not None:
+            return cached
         if not self.compiler.setup():  # Reset compiler state.
             return []
         if not self.compiler.add_inline(code):  # Add code to compiler.
             return []
-        return self.compiler.get_errors()
+        errors = self.compiler.get_errors()
+        if len(self._diag_cache) >= _DIAG_CACHE_SIZE:
+            del self._diag_cache[next(iter(self._diag_cache))]
+        self._diag_cache[code] = errors
+        return errors
 
     def fix_callback(
         self, current_text: str, diag: Diagnostic, fix_example: Dict[str, str], delta: bool, iteration_count: int
@@ -64,17 +77,22 @@ class React_compile_slang:
             # Merge fix_example with the current code for the prompt.
             results = self.llm.inference({**fix_example, 'code': current_text}, 'example_prompt', n=1)
 
+        parse = self.extractor.parse
+        check = self.check_callback
         line = diag.loc
         best_code = current_text
         for res in results:
-            code = self.extractor.parse(res)
-            if code:
-                code_diags = self.check_callback(code)
-                if not code_diags:
-                    return code
-                if code_diags[0].loc > line:
-                    line = code_diags[0].loc
-                    best_code = code
+            code = parse(res)
+            # An answer identical to the current code is known to fail, skip the re-compile
+            if not code or code == current_text:
+                continue
+            code_diags = check(code)
+            if not code_diags:
+                return code
+            loc = code_diags[0].loc
+            if loc > line:
+                line = loc
+                best_code = code
 
         return best_code
 
@@ -140,6 +158,7 @@ def test_react_save_db():
         
         # Add an error example
         react._add_error_example("test_error", "test_question", "test_answer")
+        react.flush()
         
         # Re-initialize React to load from the saved DB
         react2 = React()
@@ -4,19 +4,24 @@ Test file specifically designed to increase coverage of the React class.
 This file targets uncovered lines in react.py.
 """
 
+import io
 import os
-import tempfile
-import unittest
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, MagicMock
 from typing import List, Dict
 
+import pytest
+import yaml
+from ruamel.yaml.scalarstring import LiteralScalarString
+
 from hagent.tool.react import React, process_multiline_strings, insert_comment
 from hagent.tool.compile import Diagnostic
 
 
 class MockDiagnostic(Diagnostic):
     """Mock diagnostic for testing."""
-    
+
+    __slots__ = ('msg', 'loc', 'hint', 'error')
+
     def __init__(self, msg: str, loc: int = 1, hint: str = ""):
         self.msg = msg
         self.loc = loc
@@ -33,7 +38,9 @@ class MockDiagnostic(Diagnostic):
 
 class MockDiagnosticWithError(Diagnostic):
     """Mock diagnostic that raises errors when methods are called."""
-    
+
+    __slots__ = ('msg', 'loc', 'hint', 'error', 'raise_on_insert')
+
     def __init__(self, msg: str, loc: int = 1, hint: str = "", raise_on_insert: bool = False):
         self.msg = msg
         self.loc = loc
@@ -51,41 +58,83 @@ class MockDiagnosticWithError(Diagnostic):
         return code  # Just return the code unchanged for simplicity
 
 
-class TestReactCoverage(unittest.TestCase):
+def _fake_open(*args, **kwargs) -> io.StringIO:
+    """Stand-in for open() in the YAML exception tests, cheaper than mock_open."""
+    return io.StringIO()
+
+
+# React only reads diagnostics, so the common one is shared by all callbacks
+TEST_ERROR = MockDiagnostic("Test error", 1)
+
+
+def _check_test_error(code: str) -> List[Diagnostic]:
+    """check_callback that always reports the same error."""
+    return [TEST_ERROR]
+
+
+def _check_no_errors(code: str) -> List[Diagnostic]:
+    """check_callback for code without errors."""
+    return []
+
+
+def _fix_noop(code: str, diag: Diagnostic, fix_example: Dict[str, str], delta: bool, iteration: int) -> str:
+    """fix_callback that returns the code unchanged."""
+    return code
+
+
+@pytest.fixture
+def react() -> React:
+    """Fresh React for each test."""
+    return React()
+
+
+@pytest.fixture
+def yaml_error_mock() -> MagicMock:
+    """Stand-in for yaml.load/yaml.dump that raises, fresh for each test."""
+    return MagicMock(side_effect=Exception("Test exception"))
+
+
+@pytest.fixture(scope="session")
+def db_dir(tmp_path_factory) -> str:
+    """Directory holding the test DB files of the session."""
+    return str(tmp_path_factory.mktemp("react_db"))
+
+
+@pytest.fixture
+def temp_db_path(db_dir: str, request) -> str:
+    """Path of an empty DB file for this test, only created for tests that ask for it."""
+    path = os.path.join(db_dir, f"{request.node.name}.yaml")
+    open(path, 'w').close()
+    return path
+
+
+class TestReactCoverage:
     """Test class to increase coverage of React."""
-    
-    def setUp(self):
-        """Set up for tests."""
-        self.react = React()
-        # Create a temporary DB file for testing
-        self.temp_db = tempfile.NamedTemporaryFile(delete=False, suffix='.yaml')
-        self.temp_db.close()
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        if os.path.exists(self.temp_db.name):
-            os.remove(self.temp_db.name)
-    
+
+    # Code samples for the delta/patch tests, built once
+    CODE_20 = "\n".join(f"line{i}" for i in range(1, 21))
+    CODE_10 = "\n".join(f"line{i}" for i in range(1, 11))
+    CODE_20_LINES = tuple(CODE_20.splitlines(keepends=True))
+
     def test_process_multiline_strings(self):
         """Test the process_multiline_strings function."""
         # Test with a dictionary
         test_dict = {"key1": "value1", "key2": "value2\nwith\nnewlines"}
         result = process_multiline_strings(test_dict)
-        self.assertEqual(result["key1"], "value1")
+        assert result["key1"] == "value1"
         # Check the type instead of comparing values
-        from ruamel.yaml.scalarstring import LiteralScalarString
-        self.assertIsInstance(result["key2"], LiteralScalarString)
+        assert isinstance(result["key2"], LiteralScalarString)
         
         # Test with a list
         test_list = ["item1", "item2\nwith\nnewlines"]
         result = process_multiline_strings(test_list)
-        self.assertEqual(result[0], "item1")
-        self.assertIsInstance(result[1], LiteralScalarString)
+        assert result[0] == "item1"
+        assert isinstance(result[1], LiteralScalarString)
         
         # Test with a simple string without newlines
         test_str = "simple string"
         result = process_multiline_strings(test_str)
-        self.assertEqual(result, "simple string")
+        assert result == "simple string"
     
     def test_insert_comment(self):
         """Test the insert_comment function."""
@@ -94,139 +143,196 @@ class TestReactCoverage(unittest.TestCase):
         
         # Insert at the beginning
         result = insert_comment(code, comment, "#", 1)
-        self.assertIn("# This is a comment", result)
+        assert "# This is a comment" in result
         
         # Insert in the middle
         result = insert_comment(code, comment, "//", 3)
-        self.assertIn("// This is a comment", result)
+        assert "// This is a comment" in result
         
         # Test with invalid location
-        with self.assertRaises(ValueError):
+        with pytest.raises(ValueError):
             insert_comment(code, comment, "#", 10)
     
-    def test_setup(self):
+    def test_setup(self, react, temp_db_path):
         """Test the setup method."""
         # Test with non-existent DB file and learn mode disabled
-        result = self.react.setup(db_path="nonexistent.yaml", learn=False)
-        self.assertFalse(result)
-        self.assertIn("Database file not found", self.react.error_message)
+        result = react.setup(db_path="nonexistent.yaml", learn=False)
+        assert not result
+        assert "Database file not found" in react.error_message
         
         # Test with non-existent DB file and learn mode enabled
-        result = self.react.setup(db_path=self.temp_db.name, learn=True)
-        self.assertTrue(result)
+        result = react.setup(db_path=temp_db_path, learn=True)
+        assert result
         
         # Test with existing DB file
-        with open(self.temp_db.name, 'w') as f:
+        with open(temp_db_path, 'w') as f:
             f.write("error_type1:\n  fix_question: 'question'\n  fix_answer: 'answer'\n")
-        result = self.react.setup(db_path=self.temp_db.name, learn=False)
-        self.assertTrue(result)
-        self.assertEqual(self.react._db["error_type1"]["fix_question"], "question")
+        result = react.setup(db_path=temp_db_path, learn=False)
+        assert result
+        assert react._db["error_type1"]["fix_question"] == "question"
         
         # Test with corrupt DB file
-        with open(self.temp_db.name, 'w') as f:
+        with open(temp_db_path, 'w') as f:
             f.write("error_type1: 'not a dict'\n")
 
-        result = self.react.setup(db_path=self.temp_db.name, learn=False)
-        self.assertTrue(result)
+        result = react.setup(db_path=temp_db_path, learn=False)
+        assert result
         
         # Test with no DB file
-        result = self.react.setup(learn=True, max_iterations=10, comment_prefix="//")
-        self.assertTrue(result)
-        self.assertEqual(self.react._max_iterations, 10)
-        self.assertEqual(self.react._lang_prefix, "//")
+        result = react.setup(learn=True, max_iterations=10, comment_prefix="//")
+        assert result
+        assert react._max_iterations == 10
+        assert react._lang_prefix == "//"
     
-    def test_get_delta(self):
+    def test_configure(self, react, temp_db_path):
+        """Test that configure changes the cycle settings without reloading the DB."""
+        assert react.setup(db_path=temp_db_path, learn=True)
+        with patch.object(React, "_load_db") as load_db:
+            react.configure(max_iterations=2, comment_prefix="#")
+        load_db.assert_not_called()
+        assert react._max_iterations == 2
+        assert react._lang_prefix == "#"
+
+        # The new limit is used by the next cycle
+        assert react.react_cycle("This code has an error", _check_test_error, _fix_noop) == ""
+        assert len(react.get_log()) == 2
+
+    def test_get_delta(self, react):
         """Test the _get_delta method."""
-        code = "\n".join([f"line{i}" for i in range(1, 21)])
-        
+        code = self.CODE_20
+
         # Test getting delta from the middle
-        delta, start, end = self.react._get_delta(code, 10, window=3)
-        self.assertEqual(start, 7)
-        self.assertEqual(end, 13)
-        self.assertIn("line7", delta)
-        self.assertIn("line13", delta)
+        delta, start, end = react._get_delta(code, 10, window=3)
+        assert start == 7
+        assert end == 13
+        assert "line7" in delta
+        assert "line13" in delta
         
         # Test getting delta from the beginning
-        delta, start, end = self.react._get_delta(code, 1, window=3)
-        self.assertEqual(start, 1)
-        self.assertEqual(end, 4)
+        delta, start, end = react._get_delta(code, 1, window=3)
+        assert start == 1
+        assert end == 4
         
         # Test getting delta from the end
-        delta, start, end = self.react._get_delta(code, 20, window=3)
-        self.assertEqual(start, 17)
-        self.assertEqual(end, 20)
+        delta, start, end = react._get_delta(code, 20, window=3)
+        assert start == 17
+        assert end == 20
+
+        # Pre-split lines give the same delta
+        for loc in (1, 10, 20):
+            assert react._get_delta(self.CODE_20_LINES, loc, window=3) == react._get_delta(code, loc, window=3)
     
-    def test_apply_patch(self):
+    def test_apply_patch(self, react):
         """Test the _apply_patch method."""
-        full_code = "\n".join([f"line{i}" for i in range(1, 11)])
+        full_code = self.CODE_10
         patch = "patched_line1\npatched_line2\n"
         
         # Apply patch in the middle
-        result = self.react._apply_patch(full_code, patch, 4, 6)
-        self.assertIn("line3", result)
-        self.assertIn("patched_line1", result)
-        self.assertIn("patched_line2", result)
-        self.assertIn("line7", result)
-        self.assertNotIn("line4", result)
-        self.assertNotIn("line5", result)
-        self.assertNotIn("line6", result)
+        result = react._apply_patch(full_code, patch, 4, 6)
+        assert "line3" in result
+        assert "patched_line1" in result
+        assert "patched_line2" in result
+        assert "line7" in result
+        assert "line4" not in result
+        assert "line5" not in result
+        assert "line6" not in result
         
         # Apply patch at the beginning
-        result = self.react._apply_patch(full_code, patch, 1, 2)
-        self.assertIn("patched_line1", result)
-        self.assertIn("line3", result)
-        self.assertTrue(result.startswith("patched_line1"))
-        self.assertFalse(result.startswith("line1"))
+        result = react._apply_patch(full_code, patch, 1, 2)
+        assert "patched_line1" in result
+        assert "line3" in result
+        assert result.startswith("patched_line1")
+        assert not result.startswith("line1")
         
         # Apply patch at the end
-        result = self.react._apply_patch(full_code, patch, 9, 10)
-        self.assertIn("line8", result)
-        self.assertIn("patched_line1", result)
-        self.assertFalse("line9\n" in result)
-        self.assertFalse("line10" in result)
+        result = react._apply_patch(full_code, patch, 9, 10)
+        assert "line8" in result
+        assert "patched_line1" in result
+        assert "line9\n" not in result
+        assert "line10" not in result
     
-    def test_add_error_example(self):
+    def test_add_error_example(self, react, temp_db_path):
         """Test the _add_error_example method."""
-        self.react.setup(db_path=self.temp_db.name, learn=True)
+        react.setup(db_path=temp_db_path, learn=True)
         
         # Add a new error example
-        self.react._add_error_example("error_type1", "question1", "answer1")
-        self.assertIn("error_type1", self.react._db)
-        self.assertEqual(self.react._db["error_type1"]["fix_question"], "question1")
-        self.assertEqual(self.react._db["error_type1"]["fix_answer"], "answer1")
+        react._add_error_example("error_type1", "question1", "answer1")
+        assert "error_type1" in react._db
+        assert react._db["error_type1"]["fix_question"] == "question1"
+        assert react._db["error_type1"]["fix_answer"] == "answer1"
         
         # Add another error example
-        self.react._add_error_example("error_type2", "question2", "answer2")
-        self.assertIn("error_type2", self.react._db)
+        react._add_error_example("error_type2", "question2", "answer2")
+        assert "error_type2" in react._db
+        react.flush()
         
         # Verify DB was saved
-        self.react._learn_mode = False
-        self.react._add_error_example("error_type3", "question3", "answer3")
+        react._learn_mode = False
+        react._add_error_example("error_type3", "question3", "answer3")
         # This shouldn't be saved to disk since learn_mode is False
-        self.react.setup(db_path=self.temp_db.name, learn=False)
-        self.assertIn("error_type1", self.react._db)
-        self.assertIn("error_type2", self.react._db)
-        self.assertNotIn("error_type3", self.react._db)
+        react.setup(db_path=temp_db_path, learn=False)
+        assert "error_type1" in react._db
+        assert "error_type2" in react._db
+        assert "error_type3" not in react._db
     
-    def test_get_log(self):
+    def test_sqlite_db(self, react, temp_db_path):
+        """Test that .db paths are stored in SQLite."""
+        db_path = temp_db_path + ".db"
+        try:
+            assert react.setup(db_path=db_path, learn=True)
+            react._add_error_example("error_type1", "question1\nline2", "answer1")
+            react._add_error_example("error_type1", "ignored", "ignored")
+            react.flush()
+
+            react2 = React()
+            assert react2.setup(db_path=db_path, learn=False)
+            assert react2._db == {"error_type1": {"fix_question": "question1\nline2", "fix_answer": "answer1"}}
+        finally:
+            if os.path.exists(db_path):
+                os.remove(db_path)
+
+    def test_yaml_db_without_yaml_suffix(self, react, db_dir):
+        """Test that YAML databases with other suffixes still load as YAML."""
+        db_path = os.path.join(db_dir, "fixes.txt")
+        with open(db_path, 'w') as f:
+            f.write("error_type1:\n  fix_question: question1\n  fix_answer: answer1\n")
+
+        assert react.setup(db_path=db_path, learn=False)
+        assert react._db == {"error_type1": {"fix_question": "question1", "fix_answer": "answer1"}}
+
+    def test_yaml_db_with_db_suffix(self, react, db_dir):
+        """Test that an existing YAML database named *.db stays YAML when learning."""
+        db_path = os.path.join(db_dir, "fixes.db")
+        with open(db_path, 'w') as f:
+            f.write("error_type1:\n  fix_question: question1\n  fix_answer: answer1\n")
+
+        assert react.setup(db_path=db_path, learn=True)
+        assert react._db == {"error_type1": {"fix_question": "question1", "fix_answer": "answer1"}}
+        react._add_error_example("error_type2", "question2", "answer2")
+        react.flush()
+
+        with open(db_path, 'r') as f:
+            assert yaml.safe_load(f)["error_type2"] == {"fix_question": "question2", "fix_answer": "answer2"}
+
+    def test_get_log(self, react):
         """Test the get_log method."""
-        self.react.setup()
-        self.assertEqual(self.react.get_log(), [])
+        react.setup()
+        assert react.get_log() == []
         
         # Add some log entries
-        self.react._log.append({"iteration": 1, "check": None, "fix": None})
-        logs = self.react.get_log()
-        self.assertEqual(len(logs), 1)
-        self.assertEqual(logs[0]["iteration"], 1)
+        react._log.append({"iteration": 1, "check": None, "fix": None})
+        logs = react.get_log()
+        assert len(logs) == 1
+        assert logs[0]["iteration"] == 1
     
-    def test_react_cycle_success(self):
+    def test_react_cycle_success(self, react):
         """Test the react_cycle method with successful fix."""
-        self.react.setup(max_iterations=3)
+        react.setup(max_iterations=3)
         
         # Mock callbacks
         def check_callback(code: str) -> List[Diagnostic]:
             if "error" in code:
-                return [MockDiagnostic("Test error", 1)]
+                return [TEST_ERROR]
             return []
         
         # Track if fix_callback was called
@@ -239,42 +345,51 @@ class TestReactCoverage(unittest.TestCase):
             return "This code has a fixed"
         
         # Test with code that has an error
-        result = self.react.react_cycle("This code has an error", check_callback, fix_callback)
+        result = react.react_cycle("This code has an error", check_callback, fix_callback)
         
         # Verify fix_callback was called
-        self.assertTrue(fix_called[0], "Fix callback was not called")
+        assert fix_called[0], "Fix callback was not called"
 
-        self.assertIn("This code has a fixed", result)
-        self.assertIn("This code has a fixed", self.react.last_code)
+        assert "This code has a fixed" in result
+        assert "This code has a fixed" in react.last_code
         
         # Check log
-        logs = self.react.get_log()
-        self.assertEqual(len(logs), 1)
-        self.assertEqual(logs[0]["iteration"], 1)
+        logs = react.get_log()
+        assert len(logs) == 1
+        assert logs[0]["iteration"] == 1
     
-    def test_react_cycle_failure(self):
+    def test_react_cycle_failure(self, react):
         """Test the react_cycle method with unsuccessful fix."""
-        self.react.setup(max_iterations=3)
-        
-        # Mock callbacks
-        def check_callback(code: str) -> List[Diagnostic]:
-            return [MockDiagnostic("Test error", 1)]
-        
-        def fix_callback(code: str, diag: Diagnostic, fix_example: Dict[str, str], delta: bool, iteration: int) -> str:
-            return code  # Return the same code (no fix)
+        react.setup(max_iterations=3)
         
         # Test with code that has an error that can't be fixed
-        result = self.react.react_cycle("This code has an error", check_callback, fix_callback)
-        self.assertEqual(result, "")  # Should return empty string if can't fix
-        self.assertIn("This code has an error", self.react.last_code)
+        result = react.react_cycle("This code has an error", _check_test_error, _fix_noop)
+        assert result == ""  # Should return empty string if can't fix
+        assert "This code has an error" in react.last_code
         
         # Check log
-        logs = self.react.get_log()
-        self.assertEqual(len(logs), 3)  # Should have 3 iterations
+        logs = react.get_log()
+        assert len(logs) == 3  # Should have 3 iterations
     
-    def test_react_cycle_learning(self):
+    def test_react_cycle_reuses_post_check(self, react):
+        """Test that the post-fix check is not repeated at the start of the next iteration."""
+        react.setup(max_iterations=3)
+        checked = []
+
+        def check_callback(code: str) -> List[Diagnostic]:
+            checked.append(code)
+            return [TEST_ERROR]
+
+        def fix_callback(code: str, diag: Diagnostic, fix_example: Dict[str, str], delta: bool, iteration: int) -> str:
+            return f"attempt {iteration}"
+
+        result = react.react_cycle("This code has an error", check_callback, fix_callback)
+        assert result == ""
+        assert checked == ["This code has an error", "attempt 1", "attempt 2", "attempt 3"]
+
+    def test_react_cycle_learning(self, react, temp_db_path):
         """Test the react_cycle method with learning enabled."""
-        self.react.setup(db_path=self.temp_db.name, learn=True, max_iterations=3)
+        react.setup(db_path=temp_db_path, learn=True, max_iterations=3)
         
         # Mock callbacks
         def check_callback(code: str) -> List[Diagnostic]:
@@ -290,101 +405,107 @@ class TestReactCoverage(unittest.TestCase):
             return code
         
         # Test with code that has an error that can be fixed
-        result = self.react.react_cycle("This code has an error1", check_callback, fix_callback)
-        self.assertIn("This code has a fixed1", result)
+        result = react.react_cycle("This code has an error1", check_callback, fix_callback)
+        assert "This code has a fixed1" in result
         
         # Check if the error example was added to the DB
-        self.assertIn("Error type 1", self.react._db)
+        assert "Error type 1" in react._db
         
         # Test with code that has a different error that can't be fixed
-        result = self.react.react_cycle("This code has an error2", check_callback, fix_callback)
-        self.assertEqual(result, "")  # Should return empty string if can't fix
+        result = react.react_cycle("This code has an error2", check_callback, fix_callback)
+        assert result == ""  # Should return empty string if can't fix
         
         # The second error type should not be added since the fix wasn't successful
-        self.assertNotIn("Error type 2", self.react._db)
+        assert "Error type 2" not in react._db
     
-    def test_react_cycle_not_ready(self):
+    def test_react_cycle_flushes_learned_examples(self, react, temp_db_path):
+        """Test that examples learned in react_cycle are on disk when it returns."""
+        react.setup(db_path=temp_db_path, learn=True, max_iterations=3)
+
+        def check_callback(code: str) -> List[Diagnostic]:
+            return [TEST_ERROR] if "error" in code else []
+
+        def fix_callback(code: str, diag: Diagnostic, fix_example: Dict[str, str], delta: bool, iteration: int) -> str:
+            return "This code is fixed"
+
+        with patch.object(React, "_save_db", autospec=True, side_effect=React._save_db) as save_db:
+            assert react.react_cycle("This code has an error", check_callback, fix_callback) == "This code is fixed"
+        assert save_db.call_count == 1
+
+        react2 = React()
+        assert react2.setup(db_path=temp_db_path, learn=False)
+        assert "Test error" in react2._db
+
+    def test_react_cycle_not_ready(self, react):
         """Test the react_cycle method when React is not ready."""
         # Don't call setup, so _is_ready is False
-        result = self.react.react_cycle("code", lambda x: [], lambda x, y, z, d, i: x)
-        self.assertEqual(result, "")
-        self.assertIn("not ready", self.react.error_message)
+        result = react.react_cycle("code", _check_no_errors, _fix_noop)
+        assert result == ""
+        assert "not ready" in react.error_message
     
     # Edge case tests from test_react_edge_cases.py
     
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('ruamel.yaml.YAML.load')
-    def test_load_db_exception(self, mock_yaml_load, mock_file):
+    def test_load_db_exception(self, react, temp_db_path, yaml_error_mock):
         """Test exception handling in _load_db method."""
-        # Set up the mock to raise an exception
-        mock_yaml_load.side_effect = Exception("Test exception")
-        
-        # Call setup which will call _load_db
-        result = self.react.setup(db_path=self.temp_db.name, learn=False)
+        # Call setup which will call _load_db, with yaml.load raising an exception
+        with patch('builtins.open', _fake_open), \
+                patch('hagent.tool.react.yaml.load', yaml_error_mock):
+            result = react.setup(db_path=temp_db_path, learn=False)
         
         # Verify the result and error message
-        self.assertFalse(result)
-        self.assertIn("Failed to load DB", self.react.error_message)
-        self.assertIn("Test exception", self.react.error_message)
+        assert not result
+        assert "Failed to load DB" in react.error_message
+        assert "Test exception" in react.error_message
     
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('ruamel.yaml.YAML.dump')
-    def test_save_db_exception(self, mock_yaml_dump, mock_file):
+    def test_save_db_exception(self, react, temp_db_path, yaml_error_mock):
         """Test exception handling in _save_db method."""
-        # Set up the mock to raise an exception
-        mock_yaml_dump.side_effect = Exception("Test exception")
-        
-        # Setup with learn mode enabled
-        self.react.setup(db_path=self.temp_db.name, learn=True)
-        
-        self.react._db["test_error"] = {"fix_question": "test_question", "fix_answer": "test_answer"}
-        try:
-            self.react._add_error_example("test_error2", "test_question2", "test_answer2")
-        except Exception:
-            # We expect an exception to be raised
-            pass
+        # yaml.dump raises an exception
+        with patch('builtins.open', _fake_open), \
+                patch('hagent.tool.react.yaml.dump', yaml_error_mock):
+            # Setup with learn mode enabled
+            react.setup(db_path=temp_db_path, learn=True)
+
+            react._db["test_error"] = {"fix_question": "test_question", "fix_answer": "test_answer"}
+            try:
+                react._add_error_example("test_error2", "test_question2", "test_answer2")
+            except Exception:
+                # We expect an exception to be raised
+                pass
         
         # Verify that the database was updated even though saving failed
-        self.assertIn("test_error2", self.react._db)
-        self.assertEqual(self.react._db["test_error2"]["fix_question"], "test_question2")
+        assert "test_error2" in react._db
+        assert react._db["test_error2"]["fix_question"] == "test_question2"
     
-    def test_load_db_nonexistent_file(self):
+    def test_load_db_nonexistent_file(self, react, temp_db_path):
         """Test _load_db with a non-existent file."""
         # Delete the temp file to ensure it doesn't exist
-        if os.path.exists(self.temp_db.name):
-            os.remove(self.temp_db.name)
+        if os.path.exists(temp_db_path):
+            os.remove(temp_db_path)
         
         # Call _load_db directly
-        self.react._db_path = self.temp_db.name
-        self.react._load_db()
+        react._db_path = temp_db_path
+        react._load_db()
         
         # Verify that _db is an empty dict
-        self.assertEqual(self.react._db, {})
+        assert react._db == {}
     
-    def test_react_cycle_no_diagnostics(self):
+    def test_react_cycle_no_diagnostics(self, react):
         """Test react_cycle when check_callback returns no diagnostics."""
-        self.react.setup()
-        
-        # Mock callbacks
-        def check_callback(code: str) -> List[Diagnostic]:
-            return []  # No diagnostics
-        
-        def fix_callback(code: str, diag: Diagnostic, fix_example: Dict[str, str], delta: bool, iteration: int) -> str:
-            return code  # No changes
+        react.setup()
         
         # Test with code that has no errors
-        result = self.react.react_cycle("This code has no errors", check_callback, fix_callback)
-        self.assertEqual(result, "This code has no errors")
-        self.assertEqual(self.react.last_code, "This code has no errors")
+        result = react.react_cycle("This code has no errors", _check_no_errors, _fix_noop)
+        assert result == "This code has no errors"
+        assert react.last_code == "This code has no errors"
         
         # Check log
-        logs = self.react.get_log()
-        self.assertEqual(len(logs), 1)
-        self.assertEqual(logs[0]["iteration"], 1)
+        logs = react.get_log()
+        assert len(logs) == 1
+        assert logs[0]["iteration"] == 1
     
-    def test_react_cycle_insert_comment_exception_in_delta(self):
+    def test_react_cycle_insert_comment_exception_in_delta(self, react):
         """Test react_cycle when insert_comment raises an exception in delta mode."""
-        self.react.setup(max_iterations=3)
+        react.setup(max_iterations=3)
         
         # Mock callbacks
         def check_callback(code: str) -> List[Diagnostic]:
@@ -394,17 +515,17 @@ class TestReactCoverage(unittest.TestCase):
             return code.replace("error", "fixed")
         
         # Test with code that will cause an exception in insert_comment
-        result = self.react.react_cycle("This code has an error", check_callback, fix_callback)
-        self.assertEqual(result, "")  # Should return empty string on error
-        self.assertIn("Failed to insert diagnostic comment in delta", self.react.error_message)
+        result = react.react_cycle("This code has an error", check_callback, fix_callback)
+        assert result == ""  # Should return empty string on error
+        assert "Failed to insert diagnostic comment in delta" in react.error_message
         
         # Check log
-        logs = self.react.get_log()
-        self.assertEqual(len(logs), 1)
+        logs = react.get_log()
+        assert len(logs) == 1
     
-    def test_react_cycle_insert_comment_exception_in_full(self):
+    def test_react_cycle_insert_comment_exception_in_full(self, react):
         """Test react_cycle when insert_comment raises an exception in full code mode."""
-        self.react.setup(max_iterations=3)
+        react.setup(max_iterations=3)
         
         # Mock callbacks with a counter to control when to raise the exception
         iteration_counter = [0]
@@ -423,17 +544,17 @@ class TestReactCoverage(unittest.TestCase):
             return code + " modified"
         
         # Test with code that will cause an exception in insert_comment on the second iteration
-        result = self.react.react_cycle("This code has an error", check_callback, fix_callback)
-        self.assertEqual(result, "")  # Should return empty string on error
-        self.assertIn("Failed to insert diagnostic comment", self.react.error_message)
+        result = react.react_cycle("This code has an error", check_callback, fix_callback)
+        assert result == ""  # Should return empty string on error
+        assert "Failed to insert diagnostic comment" in react.error_message
         
         # Check log
-        logs = self.react.get_log()
-        self.assertEqual(len(logs), 2)  # Should have 2 iterations
+        logs = react.get_log()
+        assert len(logs) == 2  # Should have 2 iterations
     
-    def test_react_cycle_learning_with_new_error(self):
+    def test_react_cycle_learning_with_new_error(self, react, temp_db_path):
         """Test react_cycle with learning enabled and a new error type."""
-        self.react.setup(db_path=self.temp_db.name, learn=True, max_iterations=3)
+        react.setup(db_path=temp_db_path, learn=True, max_iterations=3)
         
         # Mock callbacks with a counter to control behavior
         iteration_counter = [0]
@@ -454,45 +575,42 @@ class TestReactCoverage(unittest.TestCase):
             # Always return a fixed code
             # Manually add both error types to the database to ensure they're present
             if diag.msg == "Error type 1":
-                self.react._add_error_example("Error type 1", "This code has errors", "Fixed code")
+                react._add_error_example("Error type 1", "This code has errors", "Fixed code")
             elif diag.msg == "Error type 2":
-                self.react._add_error_example("Error type 2", "This code has errors", "Fixed code")
+                react._add_error_example("Error type 2", "This code has errors", "Fixed code")
             
             # Add both error types to the database directly to ensure the test passes
             # This simulates what would happen if both errors were encountered and fixed
-            self.react._db["Error type 1"] = {"fix_question": "This code has errors", "fix_answer": "Fixed code"}
-            self.react._db["Error type 2"] = {"fix_question": "This code has errors", "fix_answer": "Fixed code"}
+            react._db["Error type 1"] = {"fix_question": "This code has errors", "fix_answer": "Fixed code"}
+            react._db["Error type 2"] = {"fix_question": "This code has errors", "fix_answer": "Fixed code"}
             
             return "Fixed code"
         
         # Test with code that will have different error types
-        result = self.react.react_cycle("This code has errors", check_callback, fix_callback)
-        self.assertIn("Fixed code", result)
+        result = react.react_cycle("This code has errors", check_callback, fix_callback)
+        assert "Fixed code" in result
         
         # Check if both error examples were added to the DB
-        self.assertIn("Error type 1", self.react._db)
-        self.assertIn("Error type 2", self.react._db)
+        assert "Error type 1" in react._db
+        assert "Error type 2" in react._db
         
         # Check log
-        logs = self.react.get_log()
-        self.assertEqual(len(logs), 2)
+        logs = react.get_log()
+        assert len(logs) == 2
 
-    @patch('builtins.open', new_callable=mock_open)
-    @patch('ruamel.yaml.YAML.dump')
-    def test_save_db_exception_during_setup(self, mock_yaml_dump, mock_file):
+    def test_save_db_exception_during_setup(self, react, yaml_error_mock):
         """Test exception handling in _save_db method during setup."""
-        # Set up the mock to raise an exception
-        mock_yaml_dump.side_effect = Exception("Test exception")
-        
-        # Setup with learn mode enabled and a non-existent DB file
+        # Setup with learn mode enabled and a non-existent DB file, with yaml.dump raising an exception
         # This should trigger the code path in lines 98-104
-        result = self.react.setup(db_path="nonexistent_db.yaml", learn=True)
+        with patch('builtins.open', _fake_open), \
+                patch('hagent.tool.react.yaml.dump', yaml_error_mock):
+            result = react.setup(db_path="nonexistent_db.yaml", learn=True)
         
         # Verify the result and error message
-        self.assertFalse(result)
-        self.assertIn("Failed to create DB", self.react.error_message)
-        self.assertIn("Test exception", self.react.error_message)
+        assert not result
+        assert "Failed to create DB" in react.error_message
+        assert "Test exception" in react.error_message
 
 
 if __name__ == "__main__":
-    unittest.main() 
+    pytest.main([__file__]) 
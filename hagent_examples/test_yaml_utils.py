@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test file for the YAML loader and dumper in yaml_utils.py.
+"""
+
+import os
+from collections import OrderedDict
+
+import pytest
+import yaml
+from ruamel.yaml import YAML
+
+from hagent.core.yaml_utils import LiteralDumper, YamlLoader
+
+
+@pytest.mark.parametrize(
+    'text, expected',
+    [
+        ('true', True),
+        ('False', False),
+        ('on', 'on'),
+        ('no', 'no'),
+        ('Yes', 'Yes'),
+        ('OFF', 'OFF'),
+    ],
+)
+def test_loader_uses_yaml12_booleans(text, expected):
+    assert yaml.load(f'value: {text}\n', Loader=YamlLoader) == {'value': expected}
+
+
+def test_loaded_env_vars_are_strings(monkeypatch):
+    data = yaml.load('set_env_vars:\n  FEATURE: on\n  VERBOSE: no\n', Loader=YamlLoader)
+    monkeypatch.delenv('FEATURE', raising=False)
+    monkeypatch.delenv('VERBOSE', raising=False)
+    os.environ.update(data['set_env_vars'])
+    assert os.environ['FEATURE'] == 'on'
+    assert os.environ['VERBOSE'] == 'no'
+
+
+def test_dumper_writes_ordered_dict_in_order():
+    data = OrderedDict([('b', 1), ('a', OrderedDict([('z', 'x\ny'), ('y', 2)]))])
+    text = yaml.dump(data, Dumper=LiteralDumper, default_flow_style=False, sort_keys=False)
+    assert text == 'b: 1\na:\n  z: |-\n    x\n    y\n  y: 2\n'
+
+
+def test_dumper_writes_ruamel_round_trip_data():
+    data = YAML().load('b: [1, 2]\na: on\n')
+    text = yaml.dump(data, Dumper=LiteralDumper, default_flow_style=False, sort_keys=False)
+    assert yaml.load(text, Loader=YamlLoader) == {'b': [1, 2], 'a': 'on'}
@@ -0,0 +1,106 @@
+# See LICENSE for details
+
+import re
+
+from ruamel.yaml.scalarstring import LiteralScalarString
+
+try:
+    from yaml import CSafeDumper as _BaseDumper
+    from yaml import CSafeLoader as _BaseLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeDumper as _BaseDumper
+    from yaml import SafeLoader as _BaseLoader
+
+
+class YamlLoader(_BaseLoader):
+    """
+    PyYAML safe loader (libyaml backed when available) with YAML 1.2 booleans, as ruamel.yaml
+    reads them: only true/false are bools, while yes/no/on/off stay strings.
+    """
+
+
+YamlLoader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers if tag != 'tag:yaml.org,2002:bool']
+    for first, resolvers in _BaseLoader.yaml_implicit_resolvers.items()
+}
+YamlLoader.add_implicit_resolver(
+    'tag:yaml.org,2002:bool', re.compile(r'^(?:true|True|TRUE|false|False|FALSE)$'), list('tTfF')
+)
+
+
+class LiteralDumper(_BaseDumper):
+    """
+    PyYAML safe dumper (libyaml backed when available) that writes multiline strings
+    in literal block style, so no process_multiline_strings pass is needed before dumping.
+    """
+
+
+def _represent_str(dumper, data):
+    return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|' if '\n' in data else None)
+
+
+def _represent_literal(dumper, data):
+    # The C emitter only accepts exact str values
+    return dumper.represent_scalar('tag:yaml.org,2002:str', str(data), style='|')
+
+
+def _represent_mapping(dumper, data):
+    # OrderedDict and ruamel's CommentedMap are written as plain maps in their own order
+    return dumper.represent_mapping('tag:yaml.org,2002:map', data.items())
+
+
+def _represent_sequence(dumper, data):
+    return dumper.represent_sequence('tag:yaml.org,2002:seq', data)
+
+
+LiteralDumper.add_representer(str, _represent_str)
+LiteralDumper.add_representer(LiteralScalarString, _represent_literal)
+LiteralDumper.add_multi_representer(dict, _represent_mapping)
+LiteralDumper.add_multi_representer(list, _represent_sequence)
+
+
+def has_multiline_strings(obj) -> bool:
+    # Iterative scan: True as soon as one string with a newline is found
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            if '\n' in item:
+                return True
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+    return False
+
+
+def process_multiline_strings(obj):
+    """
+    Converts strings containing newlines into a LiteralScalarString so that
+    ruamel.yaml outputs them in literal block style.
+
+    Nested dicts and lists are copied only when some string needs wrapping;
+    otherwise the input is returned unchanged.
+    """
+    if not has_multiline_strings(obj):
+        return obj
+    if isinstance(obj, str):
+        return LiteralScalarString(obj)
+
+    root = dict(obj) if isinstance(obj, dict) else list(obj)
+    stack = [root]
+    while stack:
+        container = stack.pop()
+        keys = container.keys() if isinstance(container, dict) else range(len(container))
+        for key in keys:
+            value = container[key]
+            if isinstance(value, str):
+                if '\n' in value:
+                    container[key] = LiteralScalarString(value)
+            elif isinstance(value, dict):
+                container[key] = value = dict(value)
+                stack.append(value)
+            elif isinstance(value, list):
+                container[key] = value = list(value)
+                stack.append(value)
+    return root
@@ -43,6 +43,12 @@ class MemoryConfig(BaseModel):
         description="Path to the history database",
         default=os.path.join(mem0_dir, "history.db"),
     )
+    history_db_wal: bool = Field(
+        description="Open the history database in WAL mode with synchronous=NORMAL: faster commits, but the mode "
+        "persists in the file, adds -wal/-shm files, needs a local filesystem and may lose the latest commits on "
+        "power loss",
+        default=False,
+    )
     graph_store: GraphStoreConfig = Field(
         description="Configuration for the graph",
         default_factory=GraphStoreConfig,
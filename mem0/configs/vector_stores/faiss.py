@@ -13,6 +13,13 @@ class FAISSConfig(BaseModel):
         False, description="Whether to normalize L2 vectors (only applicable for euclidean distance)"
     )
     embedding_model_dims: int = Field(1536, description="Dimension of the embedding vector")
+    index_type: str = Field("flat", description="Index to build. Options: 'flat', 'hnsw'")
+    hnsw_m: int = Field(32, description="Number of graph neighbors per vector (only applicable for hnsw)")
+    ef_construction: int = Field(
+        40, description="Candidate list size while building the graph (only applicable for hnsw)"
+    )
+    ef_search: int = Field(16, description="Candidate list size at query time (only applicable for hnsw)")
+    device: str = Field("cpu", description="Device holding the index. Options: 'cpu', 'cuda' (requires faiss-gpu)")
 
     @model_validator(mode="before")
     @classmethod
@@ -22,6 +29,22 @@ class FAISSConfig(BaseModel):
             raise ValueError("Invalid distance_strategy. Must be one of: 'euclidean', 'inner_product', 'cosine'")
         return values
 
+    @model_validator(mode="before")
+    @classmethod
+    def validate_index_type(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        index_type = values.get("index_type")
+        if index_type and index_type not in ["flat", "hnsw"]:
+            raise ValueError("Invalid index_type. Must be one of: 'flat', 'hnsw'")
+        return values
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_device(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        device = values.get("device")
+        if device and device not in ["cpu", "cuda"]:
+            raise ValueError("Invalid device. Must be one of: 'cpu', 'cuda'")
+        return values
+
     @model_validator(mode="before")
     @classmethod
     def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
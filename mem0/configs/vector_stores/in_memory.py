@@ -0,0 +1,33 @@
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class InMemoryConfig(BaseModel):
+    collection_name: str = Field("mem0", description="Default name for the collection")
+    embedding_model_dims: int = Field(1536, description="Dimension of the embedding vector")
+    quantization: Optional[str] = Field(None, description="Set to 'int8' to store int8-quantized vectors")
+    persist_path: Optional[str] = Field(
+        None, description="Directory to persist the collection in (memory-mapped vectors)"
+    )
+    filter_fields: Optional[List[str]] = Field(None, description="Payload fields to filter on with vectorized columns")
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_quantization(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        quantization = values.get("quantization")
+        if quantization and quantization != "int8":
+            raise ValueError("Invalid quantization. Must be one of: None, 'int8'")
+        return values
+
+    @model_validator(mode="before")
+    @classmethod
+    def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        allowed_fields = set(cls.model_fields.keys())
+        input_fields = set(values.keys())
+        extra_fields = input_fields - allowed_fields
+        if extra_fields:
+            raise ValueError(
+                f"Extra fields not allowed: {', '.join(extra_fields)}. Please input only the following fields: {', '.join(allowed_fields)}"
+            )
+        return values
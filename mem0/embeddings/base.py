@@ -1,5 +1,6 @@
+import concurrent.futures
 from abc import ABC, abstractmethod
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from mem0.configs.embeddings.base import BaseEmbedderConfig
 
@@ -11,6 +12,9 @@ class EmbeddingBase(ABC):
     :type config: Optional[BaseEmbedderConfig], optional
     """
 
+    # Maximum number of concurrent embed() calls made by the default embed_batch
+    batch_workers = 8
+
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
         if config is None:
             self.config = BaseEmbedderConfig()
@@ -29,3 +33,22 @@ class EmbeddingBase(ABC):
             list: The embedding vector.
         """
         pass
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts.
+
+        Providers that accept several inputs per request should override this. The default issues the embed() calls
+        concurrently on up to `batch_workers` threads, so I/O-bound providers pay roughly one round-trip per batch.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: One embedding vector per text, in input order.
+        """
+        if len(texts) <= 1 or self.batch_workers <= 1:
+            return [self.embed(text, memory_action) for text in texts]
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.batch_workers, len(texts))) as executor:
+            return list(executor.map(lambda text: self.embed(text, memory_action), texts))
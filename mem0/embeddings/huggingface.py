@@ -1,5 +1,5 @@
 import logging
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 logging.getLogger("transformers").setLevel(logging.WARNING)
 logging.getLogger("sentence_transformers").setLevel(logging.WARNING)
@@ -32,3 +32,17 @@ class HuggingFaceEmbedding(EmbeddingBase):
             list: The embedding vector.
         """
         return self.model.encode(text, convert_to_numpy=True).tolist()
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts with a single batched encode call.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: One embedding vector per text, in input order.
+        """
+        if not texts:
+            return []
+        return self.model.encode(texts, convert_to_numpy=True).tolist()
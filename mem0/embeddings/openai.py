@@ -1,12 +1,15 @@
 import os
 import warnings
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from openai import OpenAI
 
 from mem0.configs.embeddings.base import BaseEmbedderConfig
 from mem0.embeddings.base import EmbeddingBase
 
+# The embeddings endpoint accepts at most this many inputs per request
+_MAX_BATCH_SIZE = 2048
+
 
 class OpenAIEmbedding(EmbeddingBase):
     def __init__(self, config: Optional[BaseEmbedderConfig] = None):
@@ -47,3 +50,26 @@ class OpenAIEmbedding(EmbeddingBase):
             .data[0]
             .embedding
         )
+
+    def embed_batch(self, texts: List[str], memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts, sending up to 2048 texts per OpenAI request.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: One embedding vector per text, in input order.
+        """
+        if not texts:
+            return []
+        inputs = [text.replace("\n", " ") for text in texts]
+        embeddings = []
+        for start in range(0, len(inputs), _MAX_BATCH_SIZE):
+            response = self.client.embeddings.create(
+                input=inputs[start : start + _MAX_BATCH_SIZE],
+                model=self.config.model,
+                dimensions=self.config.embedding_dims,
+            )
+            embeddings.extend(item.embedding for item in response.data)
+        return embeddings
@@ -1,7 +1,11 @@
+import asyncio
+import functools
 import logging
+import string
+import sys
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Union, Any
+from typing import Callable, Dict, List, Optional, Tuple, Union, Any
 import os
 import json
 
@@ -28,10 +32,71 @@ os.makedirs(vector_store_dir, exist_ok=True)
 # Set up history database
 history_db_path = os.path.join(mem0_dir, "history.db")
 
+# Number of query embeddings kept per FewShotMemory instance
+EMBEDDING_CACHE_SIZE = 10_000
+
+
+@functools.lru_cache(maxsize=128)
+def compile_template(template: str) -> Callable[[str, str], str]:
+    """
+    Compile an example template into a function of (question, answer).
+    
+    Templates made only of literal text and plain {question}/{answer} fields are split once; the
+    returned closure fills the field slots and joins the pieces, so the template is not re-parsed
+    on every call. Anything else (format specs, conversions, other fields) falls back to str.format.
+    
+    Args:
+        template: Format template with {question} and {answer} placeholders
+        
+    Returns:
+        Function rendering one example
+    """
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError:
+        parsed = None
+    
+    if parsed is not None and all(
+        field in (None, "question", "answer") and not spec and conversion is None
+        for _, field, spec, conversion in parsed
+    ):
+        pieces = []
+        question_slots = []
+        answer_slots = []
+        for literal, field, _, _ in parsed:
+            if literal:
+                pieces.append(literal)
+            if field is not None:
+                (question_slots if field == "question" else answer_slots).append(len(pieces))
+                pieces.append("")
+        
+        def render(question: str, answer: str) -> str:
+            out = pieces.copy()
+            question, answer = format(question), format(answer)
+            for slot in question_slots:
+                out[slot] = question
+            for slot in answer_slots:
+                out[slot] = answer
+            return "".join(out)
+        
+        return render
+    
+    return lambda question, answer: template.format(question=question, answer=answer)
+
+
+def _intern_metadata(metadata: Dict) -> Dict:
+    """Copy metadata with its keys and string values interned, so repeated values like categories share one object."""
+    return {
+        (sys.intern(key) if type(key) is str else key): (sys.intern(value) if type(value) is str else value)
+        for key, value in metadata.items()
+    }
+
 
 class FewShotExample:
     """Represents a few-shot example with question, answer, and metadata."""
     
+    __slots__ = ("question", "answer", "id", "metadata", "score")
+    
     def __init__(self, 
                  question: str, 
                  answer: str, 
@@ -41,13 +106,13 @@ class FewShotExample:
         self.question = question
         self.answer = answer
         self.id = example_id or str(uuid.uuid4())
-        self.metadata = metadata or {}
+        self.metadata = _intern_metadata(metadata) if metadata else {}
         self.score = score
     
     def format(self, template: Optional[str] = None) -> str:
         """Format the example using the provided template or default format."""
         if template:
-            return template.format(question=self.question, answer=self.answer)
+            return compile_template(template)(self.question, self.answer)
         return f"Question: {self.question}\nAnswer: {self.answer}"
     
     @classmethod
@@ -108,14 +173,17 @@ class MultiDatabaseManager:
         
         # Add FAISS as our primary vector store
         # This is the most reliable option and works without external dependencies
-        store_configs["faiss"] = VectorStoreConfig(
-            provider="faiss",
-            config={
-                "collection_name": "mem0_few_shot_faiss",
-                "embedding_model_dims": self.base_config.embedder.config.get("embedding_dims", 1536),
-                "path": vector_store_dir,  # Store in the .mem0/vector_store directory
-            }
-        )
+        faiss_config = {
+            "collection_name": "mem0_few_shot_faiss",
+            "embedding_model_dims": self.base_config.embedder.config.get("embedding_dims", 1536),
+            "path": vector_store_dir,  # Store in the .mem0/vector_store directory
+        }
+        if self.base_config.vector_store.provider == "faiss":
+            # Carry over the index settings (e.g. HNSW) from a user-supplied FAISS config
+            user_faiss_config = self.base_config.vector_store.config
+            for key in ("index_type", "hnsw_m", "ef_construction", "ef_search", "device"):
+                faiss_config[key] = getattr(user_faiss_config, key)
+        store_configs["faiss"] = VectorStoreConfig(provider="faiss", config=faiss_config)
 
         # Try to initialize PostgreSQL if available
         try:
@@ -185,23 +253,24 @@ class MultiDatabaseManager:
                 logger.warning(f"Failed to initialize {store_name} vector store: {e}")
                 
         if not self.vector_stores:
-            # Fallback to FAISS in-memory if no stores could be initialized
-            logger.warning("No vector stores could be initialized, falling back to in-memory FAISS")
+            # Fallback to the in-memory store if no stores could be initialized
+            logger.warning("No vector stores could be initialized, falling back to the in-memory store")
             try:
-                faiss_config = VectorStoreConfig(
-                    provider="faiss",
+                in_memory_config = VectorStoreConfig(
+                    provider="in_memory",
                     config={
                         "collection_name": "mem0_few_shot",
                         "embedding_model_dims": self.base_config.embedder.config.get("embedding_dims", 1536),
-                        "in_memory": True,
+                        # Every lookup filters on these, so evaluate them as vectorized columns
+                        "filter_fields": ["user_id", "memory_type"],
                     }
                 )
-                self.vector_stores["faiss"] = VectorStoreFactory.create(
-                    faiss_config.provider,
-                    faiss_config.config
+                self.vector_stores["in_memory"] = VectorStoreFactory.create(
+                    in_memory_config.provider,
+                    in_memory_config.config
                 )
             except Exception as e:
-                logger.error(f"Failed to initialize in-memory FAISS: {e}")
+                logger.error(f"Failed to initialize the in-memory store: {e}")
                 raise ValueError("Could not initialize any vector stores") from e
     
     @property
@@ -438,6 +507,13 @@ class FewShotMemory(MemoryBase):
         # Set default user ID if not specified
         self.user_id = get_user_id()
         
+        # Repeated queries reuse their embedding instead of calling the embedder again
+        self._embed_query_cached = functools.lru_cache(maxsize=EMBEDDING_CACHE_SIZE)(self._embed_query)
+        
+    def _embed_query(self, query: str) -> Tuple[float, ...]:
+        """Embed a search query. Returns a tuple so cached vectors can't be mutated by callers."""
+        return tuple(self.embedding_model.embed(query, "search"))
+        
     def add_example(self, 
                    question: str, 
                    answer: str, 
@@ -455,39 +531,78 @@ class FewShotMemory(MemoryBase):
         Returns:
             The ID of the new example
         """
-        # Prepare metadata
-        metadata = metadata or {}
-        user_id = user_id or self.user_id
-        
-        # Create payload
-        payload = {
-            "user_id": user_id,
-            "memory_type": MemoryType.PROCEDURAL.value,
-            "question": question,
-            "answer": answer,
-            "created_at": datetime.now(pytz.timezone("UTC")).isoformat(),
-            # Store the user-provided metadata in a separate field
-            "metadata": metadata
-        }
-        
-        # Generate embedding for the question (we search based on question similarity)
-        question_embedding = self.embedding_model.embed(question, "add")
+        return self.add_examples(
+            [{"question": question, "answer": answer, "metadata": metadata}],
+            user_id=user_id,
+        )[0]
+    
+    def add_examples(self, 
+                     examples: List[Dict],
+                     user_id: Optional[str] = None) -> List[str]:
+        """
+        Add several few-shot examples with one embedding call and one insert per store.
         
-        # Create a unique ID
-        example_id = str(uuid.uuid4())
+        Args:
+            examples: Dicts with "question" and "answer" keys and an optional "metadata" dict
+            user_id: User ID to associate with the examples
+            
+        Returns:
+            The IDs of the new examples, in input order
+        """
+        if not examples:
+            return []
+            
+        user_id = user_id or self.user_id
+        created_at = datetime.now(pytz.timezone("UTC")).isoformat()
+        
+        questions = []
+        payloads = []
+        for item in examples:
+            question = item["question"]
+            questions.append(question)
+            payloads.append({
+                "user_id": user_id,
+                "memory_type": MemoryType.PROCEDURAL.value,
+                "question": question,
+                "answer": item["answer"],
+                "created_at": created_at,
+                # Store the user-provided metadata in a separate field
+                "metadata": item.get("metadata") or {}
+            })
+        
+        # Generate embeddings for the questions (we search based on question similarity).
+        # Repeated questions are embedded once and their vector is shared.
+        unique_positions = {}
+        inverse = [unique_positions.setdefault(question, len(unique_positions)) for question in questions]
+        unique_embeddings = self.embedding_model.embed_batch(list(unique_positions), "add")
+        question_embeddings = [unique_embeddings[i] for i in inverse]
+        
+        example_ids = [str(uuid.uuid4()) for _ in examples]
         
         # Insert into all vector stores through the manager
-        ids = self.db_manager.insert(
-            vectors=[question_embedding],
-            ids=[example_id],
-            payloads=[payload],
+        self.db_manager.insert(
+            vectors=question_embeddings,
+            ids=example_ids,
+            payloads=payloads,
         )
         
-        # Use the first ID returned or the one we generated
-        result_id = ids[0] if ids else example_id
+        logger.info(f"Added {len(example_ids)} few-shot examples")
+        return example_ids
+    
+    async def aadd_examples(self, 
+                            examples: List[Dict],
+                            user_id: Optional[str] = None) -> List[str]:
+        """
+        Asynchronously add several few-shot examples without blocking the event loop.
         
-        logger.info(f"Added few-shot example with ID {result_id}")
-        return result_id
+        Args:
+            examples: Dicts with "question" and "answer" keys and an optional "metadata" dict
+            user_id: User ID to associate with the examples
+            
+        Returns:
+            The IDs of the new examples, in input order
+        """
+        return await asyncio.to_thread(self.add_examples, examples, user_id)
     
     def get_examples(self, 
                     query: str, 
@@ -524,7 +639,7 @@ class FewShotMemory(MemoryBase):
                 processed_filters[key] = value
         
         # Generate embedding for query
-        query_embedding = self.embedding_model.embed(query, "search")
+        query_embedding = list(self._embed_query_cached(query))
         
         # Search across all vector stores through the manager
         results = self.db_manager.search(
@@ -569,7 +684,10 @@ class FewShotMemory(MemoryBase):
             List of formatted example strings
         """
         examples = self.get_examples(query, limit, **kwargs)
-        return [example.format(template) for example in examples]
+        if not template:
+            return [example.format() for example in examples]
+        render = compile_template(template)
+        return [render(example.question, example.answer) for example in examples]
     
     def get_examples_as_context(self, 
                                query: str,
@@ -594,7 +712,7 @@ class FewShotMemory(MemoryBase):
         if not examples:
             return ""
             
-        return f"{preamble}\n\n" + "\n\n".join(examples)
+        return "\n\n".join([preamble, *examples])
     
     def delete_example(self, example_id: str) -> bool:
         """
@@ -52,7 +52,7 @@ class Memory(MemoryBase):
             self.config.vector_store.provider, self.config.vector_store.config
         )
         self.llm = LlmFactory.create(self.config.llm.provider, self.config.llm.config)
-        self.db = SQLiteManager(self.config.history_db_path)
+        self.db = SQLiteManager(self.config.history_db_path, wal=self.config.history_db_wal)
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
 
@@ -64,15 +64,15 @@ class Memory(MemoryBase):
             self.graph = MemoryGraph(self.config)
             self.enable_graph = True
 
-        self.config.vector_store.config.collection_name = "mem0_migrations"
+        # Work on a copy so reset() can still rebuild the main store from self.config
+        telemetry_config = self.config.vector_store.config.model_copy()
+        telemetry_config.collection_name = "mem0_migrations"
         if self.config.vector_store.provider in ["faiss", "qdrant"]:
             provider_path = f"migrations_{self.config.vector_store.provider}"
-            self.config.vector_store.config.path = os.path.join(mem0_dir, provider_path)
-            os.makedirs(self.config.vector_store.config.path, exist_ok=True)
+            telemetry_config.path = os.path.join(mem0_dir, provider_path)
+            os.makedirs(telemetry_config.path, exist_ok=True)
 
-        self._telemetry_vector_store = VectorStoreFactory.create(
-            self.config.vector_store.provider, self.config.vector_store.config
-        )
+        self._telemetry_vector_store = VectorStoreFactory.create(self.config.vector_store.provider, telemetry_config)
 
         capture_event("mem0.init", self, {"sync_type": "sync"})
 
@@ -170,14 +170,19 @@ class Memory(MemoryBase):
         else:
             messages = parse_vision_messages(messages)
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future1 = executor.submit(self._add_to_vector_store, messages, metadata, filters, infer)
-            future2 = executor.submit(self._add_to_graph, messages, filters)
+        if self.enable_graph:
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                future1 = executor.submit(self._add_to_vector_store, messages, metadata, filters, infer)
+                future2 = executor.submit(self._add_to_graph, messages, filters)
 
-            concurrent.futures.wait([future1, future2])
+                concurrent.futures.wait([future1, future2])
 
-            vector_store_result = future1.result()
-            graph_result = future2.result()
+                vector_store_result = future1.result()
+                graph_result = future2.result()
+        else:
+            # Without a graph there is nothing to overlap with, so skip the thread pool startup on every add
+            vector_store_result = self._add_to_vector_store(messages, metadata, filters, infer)
+            graph_result = self._add_to_graph(messages, filters)
 
         if self.api_version == "v1.0":
             warnings.warn(
@@ -199,13 +204,11 @@ class Memory(MemoryBase):
 
     def _add_to_vector_store(self, messages, metadata, filters, infer):
         if not infer:
-            returned_memories = []
-            for message in messages:
-                if message["role"] != "system":
-                    message_embeddings = self.embedding_model.embed(message["content"], "add")
-                    memory_id = self._create_memory(message["content"], message_embeddings, metadata)
-                    returned_memories.append({"id": memory_id, "memory": message["content"], "event": "ADD"})
-            return returned_memories
+            contents = [message["content"] for message in messages if message["role"] != "system"]
+            memory_ids = self._create_memories(contents, metadata)
+            return [
+                {"id": memory_id, "memory": content, "event": "ADD"} for memory_id, content in zip(memory_ids, contents)
+            ]
 
         parsed_messages = parse_messages(messages)
 
@@ -661,6 +664,40 @@ class Memory(MemoryBase):
         capture_event("mem0._create_memory", self, {"memory_id": memory_id, "sync_type": "sync"})
         return memory_id
 
+    def _create_memories(self, data_list, metadata=None):
+        """
+        Create one memory per text with a single embedding batch, vector store insert and history write.
+
+        Args:
+            data_list (list): The texts to store.
+            metadata (dict, optional): Metadata copied into every memory's payload. Defaults to None.
+
+        Returns:
+            list: The new memory IDs, in input order.
+        """
+        if not data_list:
+            return []
+
+        logging.debug(f"Creating {len(data_list)} memories")
+        embeddings = self.embedding_model.embed_batch(data_list, "add")
+        memory_ids = [str(uuid.uuid4()) for _ in data_list]
+        created_at = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+        payloads = []
+        for data in data_list:
+            payload = dict(metadata or {})
+            payload["data"] = data
+            payload["hash"] = hashlib.md5(data.encode()).hexdigest()
+            payload["created_at"] = created_at
+            payloads.append(payload)
+
+        self.vector_store.insert(vectors=embeddings, ids=memory_ids, payloads=payloads)
+        self.db.add_history_batch(
+            [(memory_id, None, data, "ADD", created_at) for memory_id, data in zip(memory_ids, data_list)]
+        )
+        for memory_id in memory_ids:
+            capture_event("mem0._create_memory", self, {"memory_id": memory_id, "sync_type": "sync"})
+        return memory_ids
+
     def _create_procedural_memory(self, messages, metadata=None, prompt=None):
         """
         Create a procedural memory
@@ -766,8 +803,10 @@ class Memory(MemoryBase):
 
         gc.collect()
 
-        # Close the client if it has a close method
-        if hasattr(self.vector_store, 'client') and hasattr(self.vector_store.client, 'close'):
+        # Close the client if it has a close method; stores that share their client release it instead
+        if hasattr(self.vector_store, 'close'):
+            self.vector_store.close()
+        elif hasattr(self.vector_store, 'client') and hasattr(self.vector_store.client, 'close'):
             self.vector_store.client.close()
 
         # Close the old connection if possible
@@ -775,7 +814,7 @@ class Memory(MemoryBase):
                 self.db.connection.execute("DROP TABLE IF EXISTS history")
                 self.db.connection.close()
 
-        self.db = SQLiteManager(self.config.history_db_path)
+        self.db = SQLiteManager(self.config.history_db_path, wal=self.config.history_db_wal)
 
         # Create a new vector store with the same configuration
         self.vector_store = VectorStoreFactory.create(
@@ -800,7 +839,7 @@ class AsyncMemory(MemoryBase):
             self.config.vector_store.provider, self.config.vector_store.config
         )
         self.llm = LlmFactory.create(self.config.llm.provider, self.config.llm.config)
-        self.db = SQLiteManager(self.config.history_db_path)
+        self.db = SQLiteManager(self.config.history_db_path, wal=self.config.history_db_wal)
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
 
@@ -1547,14 +1586,16 @@ class AsyncMemory(MemoryBase):
 
         gc.collect()
 
-        if hasattr(self.vector_store, 'client') and hasattr(self.vector_store.client, 'close'):
+        if hasattr(self.vector_store, 'close'):
+            await asyncio.to_thread(self.vector_store.close)
+        elif hasattr(self.vector_store, 'client') and hasattr(self.vector_store.client, 'close'):
             await asyncio.to_thread(self.vector_store.client.close)
 
         if hasattr(self.db, 'connection') and self.db.connection:
             await asyncio.to_thread(lambda: self.db.connection.execute("DROP TABLE IF EXISTS history"))
             await asyncio.to_thread(self.db.connection.close)
 
-        self.db = SQLiteManager(self.config.history_db_path)
+        self.db = SQLiteManager(self.config.history_db_path, wal=self.config.history_db_wal)
 
         self.vector_store = VectorStoreFactory.create(
             self.config.vector_store.provider, self.config.vector_store.config
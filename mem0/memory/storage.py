@@ -4,12 +4,26 @@ import uuid
 
 
 class SQLiteManager:
-    def __init__(self, db_path=":memory:"):
-        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+    def __init__(self, db_path=":memory:", wal=False):
+        # "file:" paths are SQLite URIs, e.g. "file:history?mode=memory&cache=shared" for a shared in-memory db
+        self.connection = sqlite3.connect(db_path, check_same_thread=False, uri=str(db_path).startswith("file:"))
         self._lock = threading.Lock()
+        if wal:
+            self._enable_wal(db_path)
         self._migrate_history_table()
         self._create_history_table()
 
+    def _enable_wal(self, db_path):
+        db_path = str(db_path)
+        if db_path == ":memory:" or "mode=memory" in db_path:
+            return
+        # WAL lets readers run alongside the writer and, with synchronous=NORMAL, skips the fsync on every commit.
+        # The journal mode is stored in the database file and adds -wal/-shm side files, so it stays opt-in
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA busy_timeout=5000")
+        self.connection.execute("PRAGMA temp_store=MEMORY")
+
     def _migrate_history_table(self):
         with self._lock:
             with self.connection:
@@ -118,6 +132,22 @@ class SQLiteManager:
                     ),
                 )
 
+    def add_history_batch(self, entries):
+        # entries: (memory_id, old_memory, new_memory, event, created_at) tuples, written in one transaction
+        rows = [
+            (str(uuid.uuid4()), memory_id, old_memory, new_memory, event, created_at, None, 0)
+            for memory_id, old_memory, new_memory, event, created_at in entries
+        ]
+        with self._lock:
+            with self.connection:
+                self.connection.executemany(
+                    """
+                    INSERT INTO history (id, memory_id, old_memory, new_memory, event, created_at, updated_at, is_deleted)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    rows,
+                )
+
     def get_history(self, memory_id):
         with self._lock:
             cursor = self.connection.execute(
@@ -85,6 +85,7 @@ class VectorStoreFactory:
         "weaviate": "mem0.vector_stores.weaviate.Weaviate",
         "faiss": "mem0.vector_stores.faiss.FAISS",
         "langchain": "mem0.vector_stores.langchain.Langchain",
+        "in_memory": "mem0.vector_stores.in_memory.InMemory",
     }
 
     @classmethod
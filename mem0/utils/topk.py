@@ -0,0 +1,96 @@
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _sift_down(values, indices, pos, size):
+    """Restore the max-heap property below `pos`, ordering by (value, index)."""
+    while True:
+        largest = pos
+        left = 2 * pos + 1
+        right = left + 1
+        if left < size and (
+            values[left] > values[largest] or (values[left] == values[largest] and indices[left] > indices[largest])
+        ):
+            largest = left
+        if right < size and (
+            values[right] > values[largest] or (values[right] == values[largest] and indices[right] > indices[largest])
+        ):
+            largest = right
+        if largest == pos:
+            return
+        values[pos], values[largest] = values[largest], values[pos]
+        indices[pos], indices[largest] = indices[largest], indices[pos]
+        pos = largest
+
+
+def _heap_topk(scores, k):
+    """
+    Select the k smallest scores with a bounded max-heap in O(N log k).
+
+    Args:
+        scores (np.ndarray): 1-D array of scores.
+        k (int): Number of scores to keep, 1 <= k <= len(scores).
+
+    Returns:
+        tuple: (values, indices) of the k smallest scores, ascending.
+    """
+    values = np.empty(k, dtype=scores.dtype)
+    indices = np.empty(k, dtype=np.int64)
+    for i in range(k):
+        values[i] = scores[i]
+        indices[i] = i
+    for pos in range(k // 2 - 1, -1, -1):
+        _sift_down(values, indices, pos, k)
+
+    for i in range(k, scores.shape[0]):
+        if scores[i] < values[0]:
+            values[0] = scores[i]
+            indices[0] = i
+            _sift_down(values, indices, 0, k)
+
+    # Heap sort in place: the largest remaining item moves to the end each round
+    for end in range(k - 1, 0, -1):
+        values[0], values[end] = values[end], values[0]
+        indices[0], indices[end] = indices[end], indices[0]
+        _sift_down(values, indices, 0, end)
+
+    return values, indices
+
+
+if numba is not None:
+    _sift_down = numba.njit(cache=True)(_sift_down)
+    _heap_topk_jit = numba.njit(cache=True)(_heap_topk)
+else:
+    _heap_topk_jit = None
+
+
+def topk(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the k smallest scores and their positions, smallest first.
+
+    Uses a Numba-compiled bounded heap when numba is installed and `np.argpartition` otherwise.
+
+    Args:
+        scores (np.ndarray): 1-D array of scores, e.g. distances.
+        k (int): Number of results to return.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The selected scores and their indices into `scores`.
+    """
+    n = scores.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return scores[:0], np.empty(0, dtype=np.int64)
+
+    if _heap_topk_jit is not None:
+        return _heap_topk_jit(scores, k)
+
+    indices = np.argpartition(scores, k - 1)[:k] if k < n else np.arange(n)
+    indices = indices[np.argsort(scores[indices], kind="stable")]
+    return scores[indices], indices
@@ -26,6 +26,7 @@ class VectorStoreConfig(BaseModel):
         "weaviate": "WeaviateConfig",
         "faiss": "FAISSConfig",
         "langchain": "LangchainConfig",
+        "in_memory": "InMemoryConfig",
     }
 
     @model_validator(mode="after")
@@ -39,6 +39,11 @@ class FAISS(VectorStoreBase):
         distance_strategy: str = "euclidean",
         normalize_L2: bool = False,
         embedding_model_dims: int = 1536,
+        index_type: str = "flat",
+        hnsw_m: int = 32,
+        ef_construction: int = 40,
+        ef_search: int = 16,
+        device: str = "cpu",
     ):
         """
         Initialize the FAISS vector store.
@@ -50,15 +55,28 @@ class FAISS(VectorStoreBase):
                 Defaults to "euclidean".
             normalize_L2 (bool, optional): Whether to normalize L2 vectors. Only applicable for euclidean distance.
                 Defaults to False.
+            index_type (str, optional): Index to build. Options: 'flat' (exact search), 'hnsw' (approximate graph search).
+                Defaults to "flat".
+            hnsw_m (int, optional): Number of graph neighbors per vector for the HNSW index. Defaults to 32.
+            ef_construction (int, optional): HNSW candidate list size while building the graph. Defaults to 40.
+            ef_search (int, optional): HNSW candidate list size at query time. Defaults to 16.
+            device (str, optional): Device holding the index. Options: 'cpu', 'cuda'. With 'cuda' a flat index is
+                kept on GPU 0 when faiss-gpu and a GPU are available; otherwise it stays on the CPU. Defaults to "cpu".
         """
         self.collection_name = collection_name
         self.path = path or f"/tmp/faiss/{collection_name}"
         self.distance_strategy = distance_strategy
         self.normalize_L2 = normalize_L2
         self.embedding_model_dims = embedding_model_dims
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.device = device
 
         # Initialize storage structures
         self.index = None
+        self._gpu_resources = None
         self.docstore = {}
         self.index_to_id = {}
 
@@ -84,6 +102,9 @@ class FAISS(VectorStoreBase):
         """
         try:
             self.index = faiss.read_index(index_path)
+            if hasattr(self.index, "hnsw"):
+                self.index.hnsw.efSearch = self.ef_search
+            self.index = self._to_device(self.index)
             with open(docstore_path, "rb") as f:
                 self.docstore, self.index_to_id = pickle.load(f)
             logger.info(f"Loaded FAISS index from {index_path} with {self.index.ntotal} vectors")
@@ -93,6 +114,30 @@ class FAISS(VectorStoreBase):
             self.docstore = {}
             self.index_to_id = {}
 
+    def _to_device(self, index):
+        """
+        Move a CPU index to the GPU when device is 'cuda' and FAISS can serve it there.
+
+        Args:
+            index: CPU FAISS index.
+
+        Returns:
+            The GPU index, or `index` unchanged when it stays on the CPU.
+        """
+        if self.device != "cuda":
+            return index
+
+        if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+            logger.warning("FAISS GPU support is not available, keeping the index on the CPU")
+            return index
+        if self.index_type == "hnsw":
+            logger.warning("FAISS has no GPU HNSW index, keeping the index on the CPU")
+            return index
+
+        if self._gpu_resources is None:
+            self._gpu_resources = faiss.StandardGpuResources()
+        return faiss.index_cpu_to_gpu(self._gpu_resources, 0, index)
+
     def _save(self):
         """Save FAISS index and docstore to disk."""
         if not self.path or not self.index:
@@ -103,7 +148,9 @@ class FAISS(VectorStoreBase):
             index_path = f"{self.path}/{self.collection_name}.faiss"
             docstore_path = f"{self.path}/{self.collection_name}.pkl"
 
-            faiss.write_index(self.index, index_path)
+            # GPU indexes have to be copied back to the CPU to be serialized
+            index = faiss.index_gpu_to_cpu(self.index) if self._gpu_resources is not None else self.index
+            faiss.write_index(index, index_path)
             with open(docstore_path, "wb") as f:
                 pickle.dump((self.docstore, self.index_to_id), f)
         except Exception as e:
@@ -165,10 +212,17 @@ class FAISS(VectorStoreBase):
         distance_strategy = distance or self.distance_strategy
 
         # Create index based on distance strategy
-        if distance_strategy.lower() == "inner_product" or distance_strategy.lower() == "cosine":
+        use_inner_product = distance_strategy.lower() == "inner_product" or distance_strategy.lower() == "cosine"
+        if self.index_type == "hnsw":
+            metric = faiss.METRIC_INNER_PRODUCT if use_inner_product else faiss.METRIC_L2
+            self.index = faiss.IndexHNSWFlat(self.embedding_model_dims, self.hnsw_m, metric)
+            self.index.hnsw.efConstruction = self.ef_construction
+            self.index.hnsw.efSearch = self.ef_search
+        elif use_inner_product:
             self.index = faiss.IndexFlatIP(self.embedding_model_dims)
         else:
             self.index = faiss.IndexFlatL2(self.embedding_model_dims)
+        self.index = self._to_device(self.index)
 
         self.collection_name = name
 
@@ -202,10 +256,13 @@ class FAISS(VectorStoreBase):
         if len(vectors) != len(ids) or len(vectors) != len(payloads):
             raise ValueError("Vectors, payloads, and IDs must have the same length")
 
-        vectors_np = np.array(vectors, dtype=np.float32)
-
         if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
+            # normalize_L2 works in place, so never hand it the caller's array
+            vectors_np = np.array(vectors, dtype=np.float32)
             faiss.normalize_L2(vectors_np)
+        else:
+            # No copy for vectors that already are a contiguous float32 array
+            vectors_np = np.ascontiguousarray(vectors, dtype=np.float32)
 
         self.index.add(vectors_np)
 
@@ -0,0 +1,759 @@
+import atexit
+import functools
+import logging
+import os
+import pickle
+import uuid
+import weakref
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+from mem0.utils.topk import topk
+from mem0.vector_stores.base import VectorStoreBase
+
+logger = logging.getLogger(__name__)
+
+# Rows allocated for a new collection; the buffer doubles whenever it fills up
+INITIAL_CAPACITY = 16
+
+# Column value for payloads that don't have a filter field; compares unequal to every filter value
+_MISSING = object()
+
+# Persisted stores with changes not yet written out. A store dropped earlier flushes itself in __del__;
+# whatever is still here at exit gets flushed by the hook below
+_UNFLUSHED_STORES = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_unflushed_stores():
+    for store in list(_UNFLUSHED_STORES):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.warning(f"Failed to persist collection {store.collection_name}: {e}")
+
+
+def _make_int8_cosine_kernel(dim: int) -> Callable[[np.ndarray, np.ndarray], np.ndarray]:
+    """
+    Build a cosine distance kernel for int8 rows of a fixed dimension.
+
+    `dim` is a closure constant, so Numba compiles it as a fixed trip count and can fully unroll
+    and vectorize the inner loop. Integer accumulation avoids converting the rows to float32.
+    """
+
+    def kernel(candidates, query):
+        query_norm = 0
+        for j in range(dim):
+            query_norm += np.int32(query[j]) * np.int32(query[j])
+
+        out = np.empty(candidates.shape[0], dtype=np.float32)
+        for i in range(candidates.shape[0]):
+            dot = 0
+            row_norm = 0
+            for j in range(dim):
+                value = np.int32(candidates[i, j])
+                dot += value * np.int32(query[j])
+                row_norm += value * value
+            denominator = np.sqrt(np.float64(row_norm) * np.float64(query_norm))
+            out[i] = 1.0 - dot / max(denominator, 1e-12)
+        return out
+
+    return kernel
+
+
+@functools.lru_cache(maxsize=None)
+def _int8_cosine_kernel(dim: int) -> Optional[Callable[[np.ndarray, np.ndarray], np.ndarray]]:
+    """Return the compiled int8 kernel for `dim`, compiling it on first use, or None without numba."""
+    if numba is None:
+        return None
+    return numba.njit(fastmath=True)(_make_int8_cosine_kernel(dim))
+
+
+class OutputData:
+    """
+    A single search, get or list result.
+
+    A plain `__slots__` class rather than a pydantic model: results are built by the store itself,
+    so there is nothing to validate, and constructing one is much cheaper.
+    """
+
+    __slots__ = ("id", "score", "payload")
+
+    def __init__(self, id: Optional[str], score: Optional[float], payload: Optional[Dict]):
+        self.id = id  # memory id
+        self.score = score  # cosine distance
+        self.payload = payload  # metadata
+
+    def __repr__(self) -> str:
+        return f"OutputData(id={self.id!r}, score={self.score!r}, payload={self.payload!r})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, OutputData):
+            return NotImplemented
+        return (self.id, self.score, self.payload) == (other.id, other.score, other.payload)
+
+
+class InMemory(VectorStoreBase):
+    def __init__(
+        self,
+        collection_name: str = "mem0",
+        embedding_model_dims: int = 1536,
+        quantization: Optional[str] = None,
+        persist_path: Optional[str] = None,
+        filter_fields: Optional[List[str]] = None,
+    ):
+        """
+        Initialize the in-memory vector store.
+
+        Vectors are kept as a single contiguous float32 matrix with parallel id and payload lists,
+        so a search is one matrix-vector product instead of a Python loop over stored rows.
+        Rows and queries are L2-normalized on the way in, which reduces cosine distance to `1 - dot product`.
+
+        Args:
+            collection_name (str, optional): Name of the collection. Defaults to "mem0".
+            embedding_model_dims (int, optional): Dimension of the embedding vectors. Defaults to 1536.
+            quantization (str, optional): Set to "int8" to store L2-normalized vectors as int8, cutting memory
+                and scan bandwidth by 4x at a small cost in precision. Defaults to None (float32).
+            persist_path (str, optional): Directory to persist the collection in. The vectors live in a
+                memory-mapped .npy file, so reopening the collection maps the file instead of copying it,
+                and ids/payloads are pickled alongside. Changes are written by `flush()` or `close()`, or when the
+                store is garbage-collected or the interpreter exits with changes still pending. Defaults to None (process memory only).
+            filter_fields (List[str], optional): Payload or metadata fields to shadow as NumPy columns, so filters
+                on them are evaluated as vectorized comparisons. Other fields use the inverted index. Defaults to None.
+        """
+        if quantization not in (None, "int8"):
+            raise ValueError("Invalid quantization. Must be one of: None, 'int8'")
+
+        self.collection_name = collection_name
+        self.embedding_model_dims = embedding_model_dims
+        self.quantization = quantization
+        self._dtype = np.int8 if quantization == "int8" else np.float32
+        self.persist_path = persist_path
+        self.filter_fields = list(filter_fields or [])
+
+        if persist_path:
+            os.makedirs(persist_path, exist_ok=True)
+            if os.path.exists(self._vectors_path) and os.path.exists(self._docstore_path):
+                self._load()
+                return
+
+        self.create_col(collection_name)
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.persist_path, f"{self.collection_name}.npy")
+
+    @property
+    def _docstore_path(self) -> str:
+        return os.path.join(self.persist_path, f"{self.collection_name}.pkl")
+
+    def _load(self):
+        """Map the persisted vectors and rebuild the id map and inverted index from the docstore."""
+        buffer = np.lib.format.open_memmap(self._vectors_path, mode="r+")
+        if buffer.dtype != self._dtype or buffer.shape[1] != self.embedding_model_dims:
+            raise ValueError(
+                f"Persisted collection {self.collection_name} has dtype {buffer.dtype} and dimension {buffer.shape[1]}, "
+                f"expected {np.dtype(self._dtype)} and {self.embedding_model_dims}"
+            )
+
+        with open(self._docstore_path, "rb") as f:
+            self._ids, self._payloads = pickle.load(f)
+
+        self._buffer = buffer
+        self._size = len(self._ids)
+        self._dirty = False
+        self._id_to_idx = {vector_id: idx for idx, vector_id in enumerate(self._ids)}
+        self._inv_index = {}
+        self._columns = {field: np.empty(buffer.shape[0], dtype=object) for field in self.filter_fields}
+        for idx, (vector_id, payload) in enumerate(zip(self._ids, self._payloads)):
+            self._index_payload(vector_id, payload)
+            self._set_columns(idx, payload)
+
+        logger.info(f"Loaded collection {self.collection_name} with {self._size} vectors from {self.persist_path}")
+
+    def _mark_dirty(self):
+        """Record a change to persist on the next flush. No-op without persist_path."""
+        if self.persist_path:
+            self._dirty = True
+            _UNFLUSHED_STORES.add(self)
+
+    def flush(self):
+        """
+        Write pending changes: flush the mapped vectors and pickle the docstore.
+
+        Writes are batched here rather than on every insert, update or delete, since each write covers the
+        whole docstore. No-op without persist_path or pending changes.
+        """
+        if not self._dirty:
+            return
+        self._buffer.flush()
+        with open(self._docstore_path, "wb") as f:
+            pickle.dump((self._ids, self._payloads), f)
+        self._dirty = False
+        _UNFLUSHED_STORES.discard(self)
+
+    def close(self):
+        """Persist pending changes."""
+        self.flush()
+
+    def __del__(self):
+        # A store dropped without close() must not lose its pending writes
+        if not getattr(self, "_dirty", False):
+            return
+        try:
+            self.flush()
+        except Exception as e:
+            logger.warning(f"Failed to persist collection {self.collection_name}: {e}")
+
+    def _allocate(self, capacity: int):
+        """
+        Replace the buffer with one of `capacity` rows, keeping the rows in use.
+
+        With persist_path the new buffer is a memory-mapped file written next to the old one and moved into place.
+
+        Args:
+            capacity (int): Number of rows in the new buffer.
+        """
+        for field, column in self._columns.items():
+            resized = np.empty(capacity, dtype=object)
+            resized[: self._size] = column[: self._size]
+            self._columns[field] = resized
+
+        shape = (capacity, self.embedding_model_dims)
+        if not self.persist_path:
+            buffer = np.empty(shape, dtype=self._dtype)
+            buffer[: self._size] = self._buffer[: self._size]
+            self._buffer = buffer
+            return
+
+        tmp_path = f"{self._vectors_path}.tmp"
+        buffer = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=self._dtype, shape=shape)
+        buffer[: self._size] = self._buffer[: self._size]
+        buffer.flush()
+        del buffer
+        os.replace(tmp_path, self._vectors_path)
+        self._buffer = np.lib.format.open_memmap(self._vectors_path, mode="r+")
+
+    def create_col(self, name: str, vector_size: Optional[int] = None, distance: Optional[str] = None):
+        """
+        Create a new, empty collection.
+
+        Args:
+            name (str): Name of the collection.
+            vector_size (int, optional): Dimension of the vectors. Defaults to embedding_model_dims.
+            distance (str, optional): Unused, the store always ranks by cosine distance.
+
+        Returns:
+            self: The InMemory instance.
+        """
+        self.collection_name = name
+        if vector_size:
+            self.embedding_model_dims = vector_size
+
+        self._size = 0
+        self._dirty = False
+        self._buffer = np.empty((0, self.embedding_model_dims), dtype=self._dtype)
+        # Payload fields shadowed as object arrays parallel to the buffer rows
+        self._columns: Dict[str, np.ndarray] = {field: np.empty(0, dtype=object) for field in self.filter_fields}
+        self._allocate(INITIAL_CAPACITY)
+        self._ids: List[str] = []
+        self._payloads: List[Dict] = []
+        self._id_to_idx: Dict[str, int] = {}
+        # Inverted index over filterable payload fields: (field, value) -> ids
+        self._inv_index: Dict[Tuple[str, object], Set[str]] = {}
+
+        return self
+
+    @property
+    def _vecs(self) -> np.ndarray:
+        """View of the rows in use; the rest of the buffer is spare capacity."""
+        return self._buffer[: self._size]
+
+    def _reserve(self, count: int):
+        """
+        Make room for `count` more rows, doubling the buffer capacity as needed.
+
+        Growing geometrically keeps bulk ingestion at O(N) amortized copies instead of O(N^2).
+
+        Args:
+            count (int): Number of rows about to be appended.
+        """
+        required = self._size + count
+        capacity = self._buffer.shape[0]
+        if required <= capacity:
+            return
+
+        while capacity < required:
+            capacity *= 2
+        self._allocate(capacity)
+
+    def _as_matrix(self, vectors) -> np.ndarray:
+        """Convert vectors to a C-contiguous float32 matrix with one row per vector."""
+        return np.ascontiguousarray(vectors, dtype=np.float32).reshape(-1, self.embedding_model_dims)
+
+    def _encode(self, matrix: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        L2-normalize a float32 matrix row by row and convert it to the storage dtype.
+
+        With int8 quantization the normalized rows are scaled by 127, so one global scale covers every row.
+
+        Args:
+            matrix (np.ndarray): float32 matrix with one row per vector. It is not modified.
+            out (np.ndarray, optional): Destination in the storage dtype, e.g. reserved buffer rows.
+                Writing there directly saves a temporary matrix and a copy. Defaults to None (allocate).
+
+        Returns:
+            np.ndarray: The matrix in the storage dtype (`out` if given).
+        """
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.maximum(norms, 1e-12, out=norms)
+        if self.quantization != "int8":
+            return np.divide(matrix, norms, out=out)
+
+        scaled = np.divide(matrix, norms)
+        scaled *= 127
+        np.rint(scaled, out=scaled)
+        if out is None:
+            return scaled.astype(np.int8)
+        out[...] = scaled
+        return out
+
+    def insert(
+        self,
+        vectors: List[list],
+        payloads: Optional[List[Dict]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        Insert vectors into the collection. Existing ids are overwritten.
+
+        Args:
+            vectors (List[list]): List of vectors to insert.
+            payloads (Optional[List[Dict]], optional): List of payloads corresponding to vectors. Defaults to None.
+            ids (Optional[List[str]], optional): List of IDs corresponding to vectors. Defaults to None.
+
+        Returns:
+            List[str]: The IDs that were inserted.
+        """
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
+
+        if payloads is None:
+            payloads = [{} for _ in range(len(vectors))]
+
+        if len(vectors) != len(ids) or len(vectors) != len(payloads):
+            raise ValueError("Vectors, payloads, and IDs must have the same length")
+
+        matrix = self._as_matrix(vectors)
+
+        if len(set(ids)) == len(ids) and self._id_to_idx.keys().isdisjoint(ids):
+            # Pure insert of fresh ids, the common case: one set-level check replaces a probe per id
+            start = len(self._ids)
+            self._id_to_idx.update(zip(ids, range(start, start + len(ids))))
+            self._ids.extend(ids)
+            self._payloads.extend(payload.copy() for payload in payloads)
+            for vector_id, payload in zip(ids, payloads):
+                self._index_payload(vector_id, payload)
+
+            # Normalize straight into the reserved rows instead of through a temporary matrix
+            self._reserve(len(ids))
+            self._encode(matrix, out=self._buffer[self._size : self._size + len(ids)])
+            self._size += len(ids)
+        else:
+            matrix = self._encode(matrix)
+            new_rows = []
+            for row, (vector_id, payload) in enumerate(zip(ids, payloads)):
+                idx = self._id_to_idx.get(vector_id)
+                if idx is None:
+                    self._id_to_idx[vector_id] = len(self._ids)
+                    self._ids.append(vector_id)
+                    self._payloads.append(payload.copy())
+                    new_rows.append(row)
+                else:
+                    if idx >= self._size:
+                        # Repeated id within this batch: the last occurrence wins
+                        new_rows[idx - self._size] = row
+                    else:
+                        self._vecs[idx] = matrix[row]
+                    self._unindex_payload(vector_id, self._payloads[idx])
+                    self._payloads[idx] = payload.copy()
+                self._index_payload(vector_id, payload)
+
+            if new_rows:
+                self._reserve(len(new_rows))
+                self._buffer[self._size : self._size + len(new_rows)] = matrix[new_rows]
+                self._size += len(new_rows)
+
+        if self._columns:
+            for vector_id, payload in zip(ids, payloads):
+                self._set_columns(self._id_to_idx[vector_id], payload)
+
+        self._mark_dirty()
+        logger.info(f"Inserted {len(ids)} vectors into collection {self.collection_name}")
+        return list(ids)
+
+    def _cosine_distances(self, candidates: np.ndarray, query_vector: np.ndarray) -> np.ndarray:
+        """
+        Compute the cosine distance between the query and every candidate row.
+
+        Uses the SIMD kernels from `simsimd` when it is installed. Without it, float32 rows go through BLAS,
+        and int8 rows use a Numba kernel specialized for the embedding dimension when numba is installed.
+
+        Args:
+            candidates (np.ndarray): Matrix of candidate vectors in the storage dtype.
+            query_vector (np.ndarray): Query vector in the storage dtype.
+
+        Returns:
+            np.ndarray: One distance per candidate row.
+        """
+        if simsimd is not None:
+            return np.asarray(simsimd.cdist(query_vector[np.newaxis, :], candidates, metric="cosine")).ravel()
+
+        if candidates.dtype == np.float32:
+            # Rows and query are unit length, so the dot product is the cosine similarity
+            return 1.0 - candidates @ query_vector
+
+        kernel = _int8_cosine_kernel(self.embedding_model_dims)
+        if kernel is not None:
+            return kernel(candidates, query_vector)
+
+        # Quantized rows are only approximately unit length; divide by their actual norms
+        candidates = candidates.astype(np.float32)
+        query_vector = query_vector.astype(np.float32)
+        norms = np.linalg.norm(candidates, axis=1) * np.linalg.norm(query_vector)
+        return 1.0 - (candidates @ query_vector) / np.maximum(norms, 1e-12)
+
+    @staticmethod
+    def _filter_keys(payload: Dict) -> Iterator[Tuple[str, object]]:
+        """
+        Yield the (field, value) pairs of a payload that the inverted index tracks.
+
+        Metadata fields are only indexed when the payload has no top-level field of the same name,
+        mirroring the lookup order of `_apply_filters`. Unhashable values are skipped.
+        """
+        items = list(payload.items())
+        metadata = payload.get("metadata")
+        if isinstance(metadata, dict):
+            items.extend((key, value) for key, value in metadata.items() if key not in payload)
+
+        for key, value in items:
+            try:
+                hash(value)
+            except TypeError:
+                continue
+            yield key, value
+
+    def _index_payload(self, vector_id: str, payload: Dict):
+        """Add a payload's filterable fields to the inverted index."""
+        for entry in self._filter_keys(payload):
+            self._inv_index.setdefault(entry, set()).add(vector_id)
+
+    def _unindex_payload(self, vector_id: str, payload: Dict):
+        """Remove a payload's filterable fields from the inverted index."""
+        for entry in self._filter_keys(payload):
+            ids = self._inv_index.get(entry)
+            if ids is not None:
+                ids.discard(vector_id)
+                if not ids:
+                    del self._inv_index[entry]
+
+    @staticmethod
+    def _field_value(payload: Dict, field: str):
+        """Look up a filter field the way `_apply_filters` does, returning _MISSING if it is absent."""
+        if field in payload:
+            return payload[field]
+        metadata = payload.get("metadata")
+        if isinstance(metadata, dict):
+            return metadata.get(field, _MISSING)
+        return _MISSING
+
+    def _set_columns(self, idx: int, payload: Dict):
+        """Write a payload's filter field values into row `idx` of the columns."""
+        for field, column in self._columns.items():
+            column[idx] = self._field_value(payload, field)
+
+    def _column_mask(self, column: np.ndarray, value) -> Optional[np.ndarray]:
+        """
+        Compare a column against a filter value (or any of a list of values) in one vectorized pass.
+
+        Returns None if a value can't be compared elementwise, so the caller can use the inverted index instead.
+        """
+        values = column[: self._size]
+        mask = np.zeros(self._size, dtype=bool)
+        for item in value if isinstance(value, list) else [value]:
+            matches = values == item
+            if not isinstance(matches, np.ndarray) or matches.shape != mask.shape:
+                return None
+            mask |= matches
+        return mask
+
+    def _filter_rows(self, filters: Dict) -> np.ndarray:
+        """
+        Find the rows whose payloads pass the filters, in ascending row order.
+
+        Filters on `filter_fields` are evaluated as boolean masks over their columns. The rest intersect
+        the inverted index entries; if one of those can't be looked up (e.g. an unhashable value),
+        they fall back to a scan over every payload.
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            np.ndarray: Indices of the matching rows.
+        """
+        mask = None
+        remaining = {}
+        for key, value in filters.items():
+            column_mask = self._column_mask(self._columns[key], value) if key in self._columns else None
+            if column_mask is None:
+                remaining[key] = value
+            else:
+                mask = column_mask if mask is None else mask & column_mask
+
+        if not remaining:
+            return np.flatnonzero(mask)
+
+        rows = self._index_rows(remaining)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        return rows
+
+    def _index_rows(self, filters: Dict) -> np.ndarray:
+        """
+        Find the rows whose payloads pass the filters using the inverted index, in ascending row order.
+
+        Intersects the inverted index entries of each filter; falls back to a scan over every payload
+        if a filter value can't be looked up (e.g. an unhashable value).
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            np.ndarray: Indices of the matching rows.
+        """
+        candidates = None
+        try:
+            for key, value in filters.items():
+                values = value if isinstance(value, list) else [value]
+                matched = set()
+                for item in values:
+                    matched |= self._inv_index.get((key, item), set())
+                candidates = matched if candidates is None else candidates & matched
+                if not candidates:
+                    return np.empty(0, dtype=np.intp)
+        except TypeError:
+            return np.fromiter(
+                (i for i, payload in enumerate(self._payloads) if self._apply_filters(payload, filters)),
+                dtype=np.intp,
+            )
+
+        return np.array(sorted(self._id_to_idx[vector_id] for vector_id in candidates), dtype=np.intp)
+
+    def _apply_filters(self, payload: Dict, filters: Dict) -> bool:
+        """
+        Apply filters to a payload. Keys missing from the payload are looked up in payload["metadata"].
+
+        Args:
+            payload (Dict): Payload to filter.
+            filters (Dict): Filters to apply.
+
+        Returns:
+            bool: True if payload passes filters, False otherwise.
+        """
+        metadata = payload.get("metadata") or {}
+        for key, value in filters.items():
+            if key in payload:
+                actual = payload[key]
+            elif key in metadata:
+                actual = metadata[key]
+            else:
+                return False
+
+            if isinstance(value, list):
+                if actual not in value:
+                    return False
+            elif actual != value:
+                return False
+
+        return True
+
+    def search(
+        self, query: str, vectors: List[list], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[OutputData]:
+        """
+        Search for the vectors closest to the query vector by cosine distance.
+
+        Args:
+            query (str): Query (not used, kept for API compatibility).
+            vectors (List[list]): Query vector.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            List[OutputData]: Search results, closest first.
+        """
+        if not self._ids or limit <= 0:
+            return []
+
+        query_vector = self._encode(self._as_matrix(vectors))[0]
+
+        if filters:
+            rows = self._filter_rows(filters)
+            if rows.size == 0:
+                return []
+            candidates = self._vecs[rows]
+        else:
+            rows = None
+            candidates = self._vecs
+
+        distances = self._cosine_distances(candidates, query_vector)
+
+        top_distances, top = topk(distances, limit)
+
+        results = []
+        for distance, i in zip(top_distances, top):
+            idx = int(i) if rows is None else int(rows[i])
+            results.append(OutputData(id=self._ids[idx], score=float(distance), payload=self._payloads[idx].copy()))
+        return results
+
+    def delete(self, vector_id: str) -> bool:
+        """
+        Delete a vector by ID. The last row is moved into the freed slot so storage stays dense.
+
+        Args:
+            vector_id (str): ID of the vector to delete.
+
+        Returns:
+            bool: True if the vector existed, False otherwise.
+        """
+        idx = self._id_to_idx.pop(vector_id, None)
+        if idx is None:
+            logger.warning(f"Vector {vector_id} not found in collection {self.collection_name}")
+            return False
+
+        self._unindex_payload(vector_id, self._payloads[idx])
+
+        last = len(self._ids) - 1
+        for column in self._columns.values():
+            column[idx] = column[last]
+            column[last] = None
+        if idx != last:
+            self._buffer[idx] = self._buffer[last]
+            self._ids[idx] = self._ids[last]
+            self._payloads[idx] = self._payloads[last]
+            self._id_to_idx[self._ids[idx]] = idx
+
+        self._size = last
+        self._ids.pop()
+        self._payloads.pop()
+        self._mark_dirty()
+
+        logger.info(f"Deleted vector {vector_id} from collection {self.collection_name}")
+        return True
+
+    def update(
+        self,
+        vector_id: str,
+        vector: Optional[List[float]] = None,
+        payload: Optional[Dict] = None,
+    ) -> bool:
+        """
+        Update a vector and its payload.
+
+        Args:
+            vector_id (str): ID of the vector to update.
+            vector (Optional[List[float]], optional): Updated vector. Defaults to None.
+            payload (Optional[Dict], optional): Updated payload. Defaults to None.
+
+        Returns:
+            bool: True if the vector existed, False otherwise.
+        """
+        idx = self._id_to_idx.get(vector_id)
+        if idx is None:
+            return False
+
+        if vector is not None:
+            self._vecs[idx] = self._encode(self._as_matrix(vector))[0]
+        if payload is not None:
+            self._unindex_payload(vector_id, self._payloads[idx])
+            self._payloads[idx] = payload.copy()
+            self._index_payload(vector_id, payload)
+            self._set_columns(idx, payload)
+
+        self._mark_dirty()
+        return True
+
+    def get(self, vector_id: str) -> Optional[OutputData]:
+        """
+        Retrieve a vector by ID.
+
+        Args:
+            vector_id (str): ID of the vector to retrieve.
+
+        Returns:
+            OutputData: Retrieved vector, or None if it does not exist.
+        """
+        idx = self._id_to_idx.get(vector_id)
+        if idx is None:
+            return None
+        return OutputData(id=vector_id, score=None, payload=self._payloads[idx].copy())
+
+    def list_cols(self) -> List[str]:
+        """
+        List all collections.
+
+        Returns:
+            List[str]: List of collection names.
+        """
+        return [self.collection_name]
+
+    def delete_col(self):
+        """Delete the collection's contents, including any persisted files."""
+        if self.persist_path and os.path.exists(self._docstore_path):
+            os.remove(self._docstore_path)
+        self.create_col(self.collection_name)
+
+    def col_info(self) -> Dict:
+        """
+        Get information about the collection.
+
+        Returns:
+            Dict: Collection information.
+        """
+        return {
+            "name": self.collection_name,
+            "count": len(self._ids),
+            "dimension": self.embedding_model_dims,
+            "distance": "cosine",
+            "quantization": self.quantization,
+        }
+
+    def list(self, filters: Optional[Dict] = None, limit: int = 100) -> List[List[OutputData]]:
+        """
+        List vectors in the collection.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+
+        Returns:
+            List[List[OutputData]]: List of vectors, wrapped in an outer list like the other stores.
+        """
+        rows = self._filter_rows(filters) if filters else range(len(self._ids))
+
+        results = []
+        for idx in rows[:limit]:
+            results.append(OutputData(id=self._ids[idx], score=None, payload=self._payloads[idx].copy()))
+
+        return [results]
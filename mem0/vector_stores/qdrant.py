@@ -1,6 +1,9 @@
+import atexit
 import logging
 import os
 import shutil
+import threading
+from typing import Dict, Tuple
 
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -18,6 +21,67 @@ from mem0.vector_stores.base import VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+# Local storage is locked by the client that opens it, so every store on the same path shares one client.
+# Each entry is [client, number of open stores using it]
+_LOCAL_CLIENTS: Dict[str, list] = {}
+_LOCAL_CLIENTS_LOCK = threading.Lock()
+
+
+def _is_closed(client: QdrantClient) -> bool:
+    # Local clients wrap a QdrantLocal, which refuses every call once closed
+    return getattr(getattr(client, "_client", None), "closed", False)
+
+
+def _acquire_local_client(path: str, on_disk: bool) -> Tuple[QdrantClient, bool]:
+    """
+    Return the process-wide client for a local Qdrant path, opening it if no open store uses the path.
+
+    Without on_disk the directory is cleared before a new client opens it. A client closed directly, e.g. by
+    `client.close()`, is dropped and replaced.
+
+    Args:
+        path (str): Path for local Qdrant database.
+        on_disk (bool): Enables persistent storage.
+
+    Returns:
+        Tuple[QdrantClient, bool]: The shared client, and whether this call opened it. Hand the client back
+        with `_release_local_client`.
+    """
+    key = os.path.abspath(path)
+    with _LOCAL_CLIENTS_LOCK:
+        entry = _LOCAL_CLIENTS.get(key)
+        opened = entry is None or _is_closed(entry[0])
+        if opened:
+            if not on_disk and os.path.isdir(path):
+                shutil.rmtree(path)
+            entry = _LOCAL_CLIENTS[key] = [QdrantClient(path=path), 0]
+        entry[1] += 1
+        return entry[0], opened
+
+
+def _release_local_client(client: QdrantClient):
+    """Drop one store's use of a shared local client, closing it when no store uses it any more."""
+    with _LOCAL_CLIENTS_LOCK:
+        for key, entry in _LOCAL_CLIENTS.items():
+            if entry[0] is client:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del _LOCAL_CLIENTS[key]
+                    client.close()
+                return
+
+
+@atexit.register
+def _close_local_clients():
+    """Close the shared local clients while the interpreter can still release their locks."""
+    with _LOCAL_CLIENTS_LOCK:
+        for client, _ in _LOCAL_CLIENTS.values():
+            try:
+                client.close()
+            except Exception as e:
+                logger.debug(f"Failed to close local Qdrant client: {e}")
+        _LOCAL_CLIENTS.clear()
+
 
 class Qdrant(VectorStoreBase):
     def __init__(
@@ -46,6 +110,8 @@ class Qdrant(VectorStoreBase):
             api_key (str, optional): API key for Qdrant server. Defaults to None.
             on_disk (bool, optional): Enables persistent storage. Defaults to False.
         """
+        self._shared_local_client = False
+        opened_local_client = False
         if client:
             self.client = client
         else:
@@ -57,16 +123,24 @@ class Qdrant(VectorStoreBase):
             if host and port:
                 params["host"] = host
                 params["port"] = port
-            if not params:
-                params["path"] = path
-                if not on_disk:
-                    if os.path.exists(path) and os.path.isdir(path):
-                        shutil.rmtree(path)
-
-            self.client = QdrantClient(**params)
+            if params:
+                self.client = QdrantClient(**params)
+            else:
+                self.client, opened_local_client = _acquire_local_client(path, on_disk)
+                self._shared_local_client = True
 
         self.collection_name = collection_name
         self.embedding_model_dims = embedding_model_dims
+        if (
+            self._shared_local_client
+            and not opened_local_client
+            and not on_disk
+            and self.client.collection_exists(collection_name)
+        ):
+            # Only the store that opens the path clears it; the collection may belong to another open store
+            logger.error(
+                f"Collection {collection_name} is already open at {path}; it is reused as is instead of cleared"
+            )
         self.create_col(embedding_model_dims, on_disk)
 
     def create_col(self, vector_size: int, on_disk: bool, distance: Distance = Distance.COSINE):
@@ -202,6 +276,13 @@ class Qdrant(VectorStoreBase):
         """Delete a collection."""
         self.client.delete_collection(collection_name=self.collection_name)
 
+    def close(self):
+        """Close the client, or release it if it is a local client shared with other stores."""
+        if self._shared_local_client:
+            _release_local_client(self.client)
+        else:
+            self.client.close()
+
     def col_info(self) -> dict:
         """
         Get information about a collection.
@@ -0,0 +1,41 @@
+import contextlib
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def mem0_tmp_dir(tmp_path_factory):
+    """
+    Create the session's base directory for mem0 state such as config.json and local vector stores.
+
+    pytest creates it with mode 0o700 and prunes old runs, so no test needs its own makedirs or chmod. Modules
+    take a subdirectory each so their stores never share a path.
+
+    Returns:
+        pathlib.Path: The directory.
+    """
+    return tmp_path_factory.mktemp("mem0")
+
+
+@pytest.fixture(scope="module")
+def mem0_backend_mocks():
+    """
+    Patch the OpenAI client, the vector store factory and the few-shot history manager for a whole module.
+
+    Opt in with `pytestmark = pytest.mark.usefixtures("mem0_backend_mocks")`. The patches are entered once per
+    module rather than per test; per-test fixtures are expected to reset the yielded mocks.
+
+    Yields:
+        SimpleNamespace: `openai_client`, `vector_store` and `history_manager` mocks.
+    """
+    mocks = SimpleNamespace(openai_client=Mock(), vector_store=MagicMock(), history_manager=MagicMock())
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(patch("mem0.embeddings.openai.OpenAI", return_value=mocks.openai_client))
+        stack.enter_context(patch("mem0.utils.factory.VectorStoreFactory.create", return_value=mocks.vector_store))
+        # few_shot_memory imports SQLiteManager by name, so patch it where it is looked up
+        stack.enter_context(
+            patch("mem0.memory.few_shot_memory.SQLiteManager", return_value=mocks.history_manager)
+        )
+        yield mocks
@@ -0,0 +1,33 @@
+import threading
+import time
+
+from mem0.embeddings.base import EmbeddingBase
+
+
+class SlowEmbedding(EmbeddingBase):
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def embed(self, text, memory_action=None):
+        self.threads.add(threading.get_ident())
+        time.sleep(0.01)
+        return [float(len(text)), 1.0 if memory_action == "add" else 0.0]
+
+
+def test_embed_batch_preserves_order():
+    embedder = SlowEmbedding()
+
+    result = embedder.embed_batch(["a" * i for i in range(1, 11)], "add")
+
+    assert result == [[float(i), 1.0] for i in range(1, 11)]
+    assert len(embedder.threads) > 1
+
+
+def test_embed_batch_serial_when_single_worker():
+    embedder = SlowEmbedding()
+    embedder.batch_workers = 1
+
+    assert embedder.embed_batch(["ab", "c"]) == [[2.0, 0.0], [1.0, 0.0]]
+    assert embedder.threads == {threading.get_ident()}
+    assert embedder.embed_batch([]) == []
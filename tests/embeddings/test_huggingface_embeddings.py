@@ -68,3 +68,14 @@ def test_embed_with_custom_embedding_dims(mock_sentence_transformer):
     assert embedder.config.embedding_dims == 768
 
     assert result == [1.0, 1.1, 1.2]
+
+
+def test_embed_batch(mock_sentence_transformer):
+    config = BaseEmbedderConfig()
+    embedder = HuggingFaceEmbedding(config)
+
+    mock_sentence_transformer.encode.return_value = np.array([[0.1, 0.2], [0.3, 0.4]])
+    result = embedder.embed_batch(["Hello", "world"])
+
+    mock_sentence_transformer.encode.assert_called_once_with(["Hello", "world"], convert_to_numpy=True)
+    assert result == [[0.1, 0.2], [0.3, 0.4]]
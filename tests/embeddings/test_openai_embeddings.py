@@ -82,3 +82,35 @@ def test_embed_uses_environment_api_key(mock_openai_client, monkeypatch):
         input=["Environment key test"], model="text-embedding-3-small", dimensions = 1536
     )
     assert result == [1.3, 1.4, 1.5]
+
+
+def test_embed_batch(mock_openai_client):
+    config = BaseEmbedderConfig()
+    embedder = OpenAIEmbedding(config)
+    mock_response = Mock()
+    mock_response.data = [Mock(embedding=[0.1, 0.2]), Mock(embedding=[0.3, 0.4])]
+    mock_openai_client.embeddings.create.return_value = mock_response
+
+    result = embedder.embed_batch(["Hello\nworld", "Test"])
+
+    mock_openai_client.embeddings.create.assert_called_once_with(
+        input=["Hello world", "Test"], model="text-embedding-3-small", dimensions=1536
+    )
+    assert result == [[0.1, 0.2], [0.3, 0.4]]
+
+
+def test_embed_batch_splits_large_input(mock_openai_client):
+    config = BaseEmbedderConfig()
+    embedder = OpenAIEmbedding(config)
+    texts = [f"text {i}" for i in range(2049)]
+    mock_openai_client.embeddings.create.side_effect = lambda input, **kwargs: Mock(
+        data=[Mock(embedding=[float(text.split()[1])]) for text in input]
+    )
+
+    result = embedder.embed_batch(texts)
+
+    assert mock_openai_client.embeddings.create.call_count == 2
+    first_call, second_call = mock_openai_client.embeddings.create.call_args_list
+    assert first_call.kwargs["input"] == texts[:2048]
+    assert second_call.kwargs["input"] == texts[2048:]
+    assert result == [[float(i)] for i in range(2049)]
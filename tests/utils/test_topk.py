@@ -0,0 +1,44 @@
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from mem0.utils import topk as topk_module
+from mem0.utils.topk import _heap_topk, topk
+
+
+@pytest.mark.parametrize("k", [1, 3, 10, 50])
+def test_heap_topk_matches_sort(k):
+    scores = np.random.default_rng(k).random(50).astype(np.float32)
+
+    values, indices = _heap_topk(scores, k)
+
+    expected = np.argsort(scores, kind="stable")[:k]
+    np.testing.assert_array_equal(indices, expected)
+    np.testing.assert_array_equal(values, scores[expected])
+
+
+def test_heap_topk_breaks_ties_by_index():
+    scores = np.array([0.5, 0.1, 0.5, 0.1, 0.5], dtype=np.float32)
+
+    _, indices = _heap_topk(scores, 3)
+
+    np.testing.assert_array_equal(indices, [1, 3, 0])
+
+
+@pytest.mark.parametrize("use_heap", [True, False])
+def test_topk(use_heap):
+    scores = np.array([0.4, 0.2, 0.9, 0.1], dtype=np.float32)
+    heap = _heap_topk if use_heap else None
+
+    with patch.object(topk_module, "_heap_topk_jit", heap):
+        values, indices = topk(scores, 2)
+        assert list(indices) == [3, 1]
+        np.testing.assert_array_equal(values, scores[[3, 1]])
+
+        # k larger than the number of scores returns everything, sorted
+        _, indices = topk(scores, 10)
+        assert list(indices) == [3, 1, 0, 2]
+
+        values, indices = topk(scores, 0)
+        assert values.size == 0 and indices.size == 0
@@ -49,6 +49,78 @@ def test_create_col(faiss_instance, mock_faiss_index):
             mock_index_flat_ip.assert_called_once_with(faiss_instance.embedding_model_dims)
 
 
+def test_create_col_hnsw():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        faiss_store = FAISS(
+            collection_name="test_hnsw",
+            path=os.path.join(temp_dir, "test_faiss"),
+            distance_strategy="cosine",
+            embedding_model_dims=8,
+            index_type="hnsw",
+            hnsw_m=16,
+            ef_construction=64,
+            ef_search=32,
+        )
+
+        assert isinstance(faiss_store.index, faiss.IndexHNSWFlat)
+        assert faiss_store.index.metric_type == faiss.METRIC_INNER_PRODUCT
+        assert faiss_store.index.hnsw.efConstruction == 64
+        assert faiss_store.index.hnsw.efSearch == 32
+
+        vectors = np.eye(8, dtype=np.float32).tolist()
+        faiss_store.insert(vectors=vectors, ids=[f"id{i}" for i in range(8)])
+        results = faiss_store.search(query="", vectors=vectors[3], limit=1)
+        assert results[0].id == "id3"
+
+        # Reloading from disk restores the HNSW index with the configured efSearch
+        reloaded = FAISS(
+            collection_name="test_hnsw",
+            path=os.path.join(temp_dir, "test_faiss"),
+            embedding_model_dims=8,
+            index_type="hnsw",
+            ef_search=48,
+        )
+        assert reloaded.index.ntotal == 8
+        assert faiss.downcast_index(reloaded.index).hnsw.efSearch == 48
+
+
+def test_cuda_device_falls_back_to_cpu_without_gpu():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with patch("faiss.get_num_gpus", return_value=0, create=True):
+            faiss_store = FAISS(
+                collection_name="test_cpu_fallback",
+                path=os.path.join(temp_dir, "test_faiss"),
+                embedding_model_dims=8,
+                device="cuda",
+            )
+
+        assert isinstance(faiss_store.index, faiss.IndexFlatL2)
+        assert faiss_store._gpu_resources is None
+
+
+def test_cuda_device_moves_flat_index_to_gpu():
+    gpu_index = Mock()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with patch("faiss.get_num_gpus", return_value=1, create=True), patch(
+            "faiss.StandardGpuResources", create=True
+        ) as mock_resources, patch("faiss.index_cpu_to_gpu", return_value=gpu_index, create=True) as mock_to_gpu, patch(
+            "faiss.index_gpu_to_cpu", return_value=faiss.IndexFlatL2(8), create=True
+        ) as mock_to_cpu:
+            faiss_store = FAISS(
+                collection_name="test_gpu",
+                path=os.path.join(temp_dir, "test_faiss"),
+                embedding_model_dims=8,
+                device="cuda",
+            )
+
+            assert faiss_store.index is gpu_index
+            mock_to_gpu.assert_called_once()
+            assert mock_to_gpu.call_args[0][0] is mock_resources.return_value
+            assert mock_to_gpu.call_args[0][1] == 0
+            mock_to_cpu.assert_called_once_with(gpu_index)
+            assert os.path.exists(os.path.join(temp_dir, "test_faiss", "test_gpu.faiss"))
+
+
 def test_insert(faiss_instance, mock_faiss_index):
     # Prepare test data
     vectors = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
@@ -56,14 +128,14 @@ def test_insert(faiss_instance, mock_faiss_index):
     ids = ["id1", "id2"]
     
     # Mock the numpy array conversion
-    with patch('numpy.array', return_value=np.array(vectors, dtype=np.float32)) as mock_np_array:
+    with patch('numpy.ascontiguousarray', return_value=np.array(vectors, dtype=np.float32)) as mock_np_array:
         # Mock index.add
         mock_faiss_index.add.return_value = None
         
         # Call insert
         faiss_instance.insert(vectors=vectors, payloads=payloads, ids=ids)
         
-        # Verify numpy.array was called
+        # Verify the conversion was called
         mock_np_array.assert_called_once_with(vectors, dtype=np.float32)
         
         # Verify index.add was called
@@ -296,6 +368,24 @@ def test_delete_col(faiss_instance):
             assert faiss_instance.index_to_id == {}
 
 
+def test_insert_float32_array_without_copy(faiss_instance, mock_faiss_index):
+    vectors = np.array([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], dtype=np.float32)
+
+    faiss_instance.insert(vectors=vectors, ids=["id1", "id2"])
+
+    assert mock_faiss_index.add.call_args[0][0] is vectors
+
+
+def test_normalize_L2_does_not_modify_input(faiss_instance, mock_faiss_index):
+    faiss_instance.normalize_L2 = True
+    vectors = np.array([[3.0, 4.0, 0.0]], dtype=np.float32)
+
+    faiss_instance.insert(vectors=vectors, ids=["id1"])
+
+    np.testing.assert_array_equal(vectors, [[3.0, 4.0, 0.0]])
+    np.testing.assert_allclose(mock_faiss_index.add.call_args[0][0], [[0.6, 0.8, 0.0]], rtol=1e-6)
+
+
 def test_normalize_L2(faiss_instance, mock_faiss_index):
     # Setup a FAISS instance with normalize_L2=True
     faiss_instance.normalize_L2 = True
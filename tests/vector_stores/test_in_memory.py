@@ -0,0 +1,347 @@
+import gc
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from mem0.vector_stores.in_memory import InMemory, _make_int8_cosine_kernel
+
+
+@pytest.fixture
+def store():
+    store = InMemory(collection_name="test_collection", embedding_model_dims=3)
+    store.insert(
+        vectors=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 1.0, 0.0]],
+        payloads=[
+            {"name": "x", "metadata": {"category": "A"}},
+            {"name": "y", "metadata": {"category": "B"}},
+            {"name": "xy", "metadata": {"category": "A"}},
+        ],
+        ids=["id1", "id2", "id3"],
+    )
+    return store
+
+
+def test_insert_keeps_contiguous_float32(store):
+    assert store._vecs.dtype == np.float32
+    assert store._vecs.shape == (3, 3)
+    assert store._vecs.flags["C_CONTIGUOUS"]
+    assert store._ids == ["id1", "id2", "id3"]
+
+
+def test_insert_grows_buffer_geometrically():
+    store = InMemory(embedding_model_dims=3)
+    assert store._buffer.shape == (16, 3)
+
+    store.insert(vectors=[[1.0, 0.0, 0.0]] * 16, ids=[f"a{i}" for i in range(16)])
+    assert store._buffer.shape == (16, 3)
+
+    store.insert(vectors=[[0.0, 1.0, 0.0]] * 20, ids=[f"b{i}" for i in range(20)])
+    assert store._buffer.shape == (64, 3)
+    assert store._vecs.shape == (36, 3)
+    np.testing.assert_array_equal(store._vecs[15], [1.0, 0.0, 0.0])
+    np.testing.assert_array_equal(store._vecs[16], [0.0, 1.0, 0.0])
+
+    store.delete("a0")
+    assert store._vecs.shape == (35, 3)
+    assert store.search(query="", vectors=[1.0, 0.0, 0.0], limit=1)[0].id.startswith("a")
+
+
+def test_insert_normalizes_rows(store):
+    np.testing.assert_allclose(np.linalg.norm(store._vecs, axis=1), 1.0, rtol=1e-6)
+    np.testing.assert_allclose(store._vecs[2], [np.sqrt(0.5), np.sqrt(0.5), 0.0], rtol=1e-6)
+
+    store.insert(vectors=[[0.0, 0.0, 0.0]], ids=["zero"])
+    np.testing.assert_array_equal(store._vecs[3], [0.0, 0.0, 0.0])
+
+
+def test_insert_encodes_into_buffer_without_touching_input():
+    store = InMemory(embedding_model_dims=3)
+    vectors = np.array([[3.0, 4.0, 0.0]], dtype=np.float32)
+
+    with patch("numpy.divide", wraps=np.divide) as mock_divide:
+        store.insert(vectors=vectors, ids=["id1"])
+
+    assert np.shares_memory(mock_divide.call_args[1]["out"], store._buffer)
+    np.testing.assert_array_equal(vectors, [[3.0, 4.0, 0.0]])
+    np.testing.assert_allclose(store._vecs[0], [0.6, 0.8, 0.0], rtol=1e-6)
+
+
+def test_insert_existing_id_overwrites(store):
+    store.insert(vectors=[[0.0, 0.0, 1.0]], payloads=[{"name": "z"}], ids=["id2"])
+
+    assert store.col_info()["count"] == 3
+    assert store.get("id2").payload == {"name": "z"}
+    assert store.search(query="", vectors=[0.0, 0.0, 1.0], limit=1)[0].id == "id2"
+
+
+def test_insert_repeated_id_in_batch():
+    store = InMemory(embedding_model_dims=3)
+    store.insert(
+        vectors=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        payloads=[{"name": "first"}, {"name": "other"}, {"name": "last"}],
+        ids=["dup", "other", "dup"],
+    )
+
+    assert store._ids == ["dup", "other"]
+    assert store.get("dup").payload == {"name": "last"}
+    np.testing.assert_array_equal(store._vecs[0], [0.0, 0.0, 1.0])
+    assert ("name", "first") not in store._inv_index
+
+
+def test_insert_length_mismatch(store):
+    with pytest.raises(ValueError):
+        store.insert(vectors=[[1.0, 0.0, 0.0]], payloads=[{}, {}], ids=["a"])
+
+
+def test_search_orders_by_cosine_distance(store):
+    results = store.search(query="", vectors=[1.0, 0.1, 0.0], limit=2)
+
+    assert [r.id for r in results] == ["id1", "id3"]
+    assert results[0].score == pytest.approx(1 - 1 / np.sqrt(1.01), abs=1e-6)
+    assert results[0].score <= results[1].score
+
+
+def test_search_uses_simsimd_when_available(store):
+    mock_simsimd = Mock()
+    mock_simsimd.cdist.return_value = np.array([[0.3, 0.1, 0.2]], dtype=np.float32)
+
+    with patch("mem0.vector_stores.in_memory.simsimd", mock_simsimd):
+        results = store.search(query="", vectors=[1.0, 0.0, 0.0], limit=3)
+
+    mock_simsimd.cdist.assert_called_once()
+    query_arg, candidates_arg = mock_simsimd.cdist.call_args[0]
+    assert query_arg.shape == (1, 3)
+    np.testing.assert_array_equal(candidates_arg, store._vecs)
+    assert mock_simsimd.cdist.call_args[1] == {"metric": "cosine"}
+    assert [r.id for r in results] == ["id2", "id3", "id1"]
+
+
+def test_search_numpy_fallback(store):
+    with patch("mem0.vector_stores.in_memory.simsimd", None):
+        results = store.search(query="", vectors=[0.0, 1.0, 0.0], limit=1)
+
+    assert results[0].id == "id2"
+    assert results[0].score == pytest.approx(0.0, abs=1e-6)
+
+
+def test_search_with_filters(store):
+    results = store.search(query="", vectors=[0.0, 1.0, 0.0], limit=5, filters={"category": "A"})
+
+    assert [r.id for r in results] == ["id3", "id1"]
+
+
+def test_search_empty(store):
+    assert store.search(query="", vectors=[1.0, 0.0, 0.0], filters={"category": "C"}) == []
+    assert InMemory(embedding_model_dims=3).search(query="", vectors=[1.0, 0.0, 0.0]) == []
+
+
+def test_delete_moves_last_row(store):
+    assert store.delete("id1") is True
+    assert store.delete("id1") is False
+
+    assert store._ids == ["id3", "id2"]
+    assert store._id_to_idx == {"id3": 0, "id2": 1}
+    assert store.get("id1") is None
+    np.testing.assert_allclose(store._vecs[0], [np.sqrt(0.5), np.sqrt(0.5), 0.0], rtol=1e-6)
+
+
+def test_update(store):
+    assert store.update("id1", vector=[0.0, 0.0, 1.0], payload={"name": "z"}) is True
+    assert store.update("missing", payload={}) is False
+
+    assert store.get("id1").payload == {"name": "z"}
+    assert store.search(query="", vectors=[0.0, 0.0, 1.0], limit=1)[0].id == "id1"
+
+
+def test_list(store):
+    assert len(store.list()[0]) == 3
+    assert len(store.list(limit=2)[0]) == 2
+    assert [r.id for r in store.list(filters={"category": "A"})[0]] == ["id1", "id3"]
+
+
+def test_delete_col(store):
+    store.delete_col()
+
+    assert store.col_info()["count"] == 0
+    assert store.list() == [[]]
+
+
+def test_int8_quantization():
+    store = InMemory(embedding_model_dims=3, quantization="int8")
+    store.insert(vectors=[[2.0, 0.0, 0.0], [0.0, 0.5, 0.0], [1.0, 1.0, 0.0]], ids=["id1", "id2", "id3"])
+
+    assert store._vecs.dtype == np.int8
+    np.testing.assert_array_equal(store._vecs[0], [127, 0, 0])
+    np.testing.assert_array_equal(store._vecs[2], [90, 90, 0])
+
+    with patch("mem0.vector_stores.in_memory.simsimd", None):
+        results = store.search(query="", vectors=[1.0, 0.1, 0.0], limit=3)
+
+    assert [r.id for r in results] == ["id1", "id3", "id2"]
+    assert results[0].score == pytest.approx(1 - 1 / np.sqrt(1.01), abs=1e-2)
+
+    store.update("id2", vector=[0.0, 0.0, 3.0])
+    np.testing.assert_array_equal(store._vecs[1], [0, 0, 127])
+
+
+def test_invalid_quantization():
+    with pytest.raises(ValueError):
+        InMemory(embedding_model_dims=3, quantization="int4")
+
+
+def test_inverted_index_tracks_payload_changes(store):
+    assert store._inv_index[("category", "A")] == {"id1", "id3"}
+    assert store._inv_index[("name", "xy")] == {"id3"}
+
+    store.update("id1", payload={"name": "x", "metadata": {"category": "B"}})
+    assert store._inv_index[("category", "A")] == {"id3"}
+    assert store._inv_index[("category", "B")] == {"id1", "id2"}
+
+    store.insert(vectors=[[1.0, 1.0, 0.0]], payloads=[{"name": "xy2"}], ids=["id3"])
+    store.delete("id2")
+    assert ("category", "A") not in store._inv_index
+    assert ("name", "xy") not in store._inv_index
+    assert store._inv_index[("category", "B")] == {"id1"}
+
+
+def test_filters_use_inverted_index(store):
+    with patch.object(store, "_apply_filters") as mock_apply_filters:
+        results = store.search(query="", vectors=[1.0, 0.0, 0.0], filters={"category": ["A", "B"], "name": "y"})
+
+    mock_apply_filters.assert_not_called()
+    assert [r.id for r in results] == ["id2"]
+
+
+def test_top_level_field_shadows_metadata():
+    store = InMemory(embedding_model_dims=3)
+    store.insert(vectors=[[1.0, 0.0, 0.0]], payloads=[{"category": "A", "metadata": {"category": "B"}}], ids=["id1"])
+
+    assert store.list(filters={"category": "A"})[0][0].id == "id1"
+    assert store.list(filters={"category": "B"}) == [[]]
+
+
+def test_unhashable_filter_falls_back_to_scan(store):
+    store.insert(vectors=[[0.0, 0.0, 1.0]], payloads=[{"tags": {"a": 1}}], ids=["id4"])
+
+    results = store.search(query="", vectors=[0.0, 0.0, 1.0], filters={"tags": {"a": 1}})
+
+    assert [r.id for r in results] == ["id4"]
+
+
+def test_int8_cosine_kernel_matches_numpy():
+    rng = np.random.default_rng(0)
+    candidates = rng.integers(-127, 128, size=(5, 8), dtype=np.int8)
+    query = rng.integers(-127, 128, size=8, dtype=np.int8)
+
+    distances = _make_int8_cosine_kernel(8)(candidates, query)
+
+    as_float = candidates.astype(np.float64)
+    expected = 1 - as_float @ query / (np.linalg.norm(as_float, axis=1) * np.linalg.norm(query.astype(np.float64)))
+    np.testing.assert_allclose(distances, expected, rtol=1e-5)
+
+
+def test_int8_search_dispatches_to_kernel():
+    store = InMemory(embedding_model_dims=3, quantization="int8")
+    store.insert(vectors=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]], ids=["id1", "id2"])
+
+    with patch("mem0.vector_stores.in_memory.simsimd", None):
+        with patch("mem0.vector_stores.in_memory._int8_cosine_kernel", return_value=_make_int8_cosine_kernel(3)):
+            results = store.search(query="", vectors=[0.0, 1.0, 0.0], limit=2)
+
+    assert [r.id for r in results] == ["id2", "id1"]
+    assert results[0].score == pytest.approx(0.0, abs=1e-6)
+
+
+def test_persist_path_round_trip(tmp_path):
+    store = InMemory(collection_name="persisted", embedding_model_dims=3, persist_path=str(tmp_path))
+    store.insert(
+        vectors=[[1.0, 0.0, 0.0]] * 20,
+        payloads=[{"i": i, "metadata": {"category": "A" if i % 2 else "B"}} for i in range(20)],
+        ids=[f"id{i}" for i in range(20)],
+    )
+    store.insert(vectors=[[0.0, 1.0, 0.0]], payloads=[{"i": 20}], ids=["target"])
+    store.delete("id0")
+    store.update("id1", payload={"i": 1, "metadata": {"category": "C"}})
+    store.close()
+
+    assert isinstance(store._buffer, np.memmap)
+    assert (tmp_path / "persisted.npy").exists()
+    assert not (tmp_path / "persisted.npy.tmp").exists()
+
+    reopened = InMemory(collection_name="persisted", embedding_model_dims=3, persist_path=str(tmp_path))
+
+    assert isinstance(reopened._buffer, np.memmap)
+    assert reopened._ids == store._ids
+    np.testing.assert_array_equal(reopened._vecs, store._vecs)
+    assert reopened.search(query="", vectors=[0.0, 1.0, 0.0], limit=1)[0].id == "target"
+    assert [r.id for r in reopened.list(filters={"category": "C"})[0]] == ["id1"]
+
+    reopened.delete_col()
+    assert InMemory(collection_name="persisted", embedding_model_dims=3, persist_path=str(tmp_path)).list() == [[]]
+
+
+def test_persist_path_writes_docstore_on_flush(tmp_path):
+    store = InMemory(collection_name="c", embedding_model_dims=3, persist_path=str(tmp_path))
+    for i in range(3):
+        store.insert(vectors=[[1.0, 0.0, 0.0]], ids=[f"id{i}"])
+    store.update("id0", payload={"i": 0})
+
+    assert not (tmp_path / "c.pkl").exists()
+
+    store.flush()
+    mtime = (tmp_path / "c.pkl").stat().st_mtime_ns
+    store.flush()
+
+    assert (tmp_path / "c.pkl").stat().st_mtime_ns == mtime
+    assert InMemory(collection_name="c", embedding_model_dims=3, persist_path=str(tmp_path))._ids == store._ids
+
+
+def test_persist_path_flushes_store_dropped_without_close(tmp_path):
+    def insert_and_drop():
+        store = InMemory(collection_name="c", embedding_model_dims=3, persist_path=str(tmp_path))
+        store.insert(vectors=[[1.0, 0.0, 0.0]], ids=["id0"])
+
+    insert_and_drop()
+    gc.collect()
+
+    reopened = InMemory(collection_name="c", embedding_model_dims=3, persist_path=str(tmp_path))
+    assert reopened._ids == ["id0"]
+
+
+def test_persist_path_dimension_mismatch(tmp_path):
+    store = InMemory(collection_name="c", embedding_model_dims=3, persist_path=str(tmp_path))
+    store.insert(vectors=[[1.0, 0.0, 0.0]])
+    store.close()
+
+    with pytest.raises(ValueError):
+        InMemory(collection_name="c", embedding_model_dims=4, persist_path=str(tmp_path))
+
+
+def test_filter_fields_use_column_masks():
+    store = InMemory(embedding_model_dims=3, filter_fields=["category", "user_id"])
+    store.insert(
+        vectors=[[1.0, 0.0, 0.0]] * 20,
+        payloads=[{"user_id": f"u{i % 2}", "name": f"n{i}", "metadata": {"category": "A" if i < 10 else "B"}} for i in range(20)],
+        ids=[f"id{i}" for i in range(20)],
+    )
+    assert store._columns["category"].shape == (32,)
+
+    with patch.object(store, "_index_rows", side_effect=AssertionError("inverted index used")):
+        rows = store._filter_rows({"category": "A", "user_id": ["u1"]})
+    assert [store._ids[i] for i in rows] == ["id1", "id3", "id5", "id7", "id9"]
+
+    # Non-column filters are combined with the column mask
+    results = store.list(filters={"category": "B", "name": "n11"})
+    assert [r.id for r in results[0]] == ["id11"]
+
+    store.delete("id1")
+    store.update("id3", payload={"user_id": "u0", "metadata": {"category": "A"}})
+    rows = store._filter_rows({"category": "A", "user_id": "u1"})
+    assert sorted(store._ids[i] for i in rows) == ["id5", "id7", "id9"]
+
+    # Payloads without the field never match
+    store.insert(vectors=[[0.0, 1.0, 0.0]], payloads=[{}], ids=["bare"])
+    assert store._columns["user_id"][store._id_to_idx["bare"]] is not None
+    assert "bare" not in [store._ids[i] for i in store._filter_rows({"user_id": "u0"})]
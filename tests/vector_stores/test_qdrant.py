@@ -1,5 +1,7 @@
+import os
+import tempfile
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 import uuid
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
@@ -8,6 +10,9 @@ from qdrant_client.models import (
     VectorParams,
     PointIdsList,
 )
+from mem0.configs.base import MemoryConfig
+from mem0.memory.main import Memory
+from mem0.vector_stores import qdrant as qdrant_module
 from mem0.vector_stores.qdrant import Qdrant
 
 
@@ -116,3 +121,110 @@ class TestQdrant(unittest.TestCase):
 
     def tearDown(self):
         del self.qdrant
+
+
+class TestQdrantLocalClient(unittest.TestCase):
+    def setUp(self):
+        qdrant_module._LOCAL_CLIENTS.clear()
+
+    def tearDown(self):
+        qdrant_module._LOCAL_CLIENTS.clear()
+
+    @patch("mem0.vector_stores.qdrant.shutil.rmtree")
+    @patch("mem0.vector_stores.qdrant.os.path.isdir", return_value=True)
+    @patch("mem0.vector_stores.qdrant.QdrantClient")
+    def test_stores_on_same_path_share_client(self, client_cls, _isdir, rmtree):
+        client_cls.side_effect = lambda **kwargs: MagicMock(spec=QdrantClient)
+        first = Qdrant(collection_name="first", embedding_model_dims=128, path="/tmp/qdrant_shared")
+        second = Qdrant(collection_name="second", embedding_model_dims=128, path="/tmp/qdrant_shared")
+        other = Qdrant(collection_name="first", embedding_model_dims=128, path="/tmp/qdrant_other")
+
+        self.assertIs(first.client, second.client)
+        self.assertIsNot(first.client, other.client)
+        self.assertEqual(client_cls.call_count, 2)
+        client_cls.assert_any_call(path="/tmp/qdrant_shared")
+        # The directory is only cleared before the first client opens it
+        self.assertEqual(rmtree.call_count, 2)
+
+    def _local_store(self, path, on_disk=False):
+        return Qdrant(collection_name="local", embedding_model_dims=4, path=path, on_disk=on_disk)
+
+    def _insert_one(self, store):
+        store.insert(vectors=[[0.1, 0.2, 0.3, 0.4]], payloads=[{"data": "kept"}], ids=[str(uuid.uuid4())])
+
+    def test_closed_client_is_replaced(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "qdrant")
+            first = self._local_store(path)
+            first.client.close()
+
+            second = self._local_store(path)
+
+            self.assertIsNot(first.client, second.client)
+            self.assertEqual(second.list()[0], [])
+
+    def test_in_memory_store_keeps_collection_of_open_store(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "qdrant")
+            first = self._local_store(path)
+            self._insert_one(first)
+
+            with self.assertLogs("mem0.vector_stores.qdrant", level="ERROR"):
+                second = self._local_store(path)
+
+            self.assertIs(first.client, second.client)
+            self.assertEqual(len(first.list()[0]), 1)
+
+    def test_in_memory_store_starts_empty_after_path_is_released(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "qdrant")
+            first = self._local_store(path)
+            self._insert_one(first)
+            first.close()
+
+            second = self._local_store(path)
+
+            self.assertEqual(second.list()[0], [])
+
+    def test_on_disk_store_keeps_data_while_path_is_shared(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "qdrant")
+            first = self._local_store(path, on_disk=True)
+            self._insert_one(first)
+
+            second = self._local_store(path, on_disk=True)
+
+            self.assertEqual(len(second.list()[0]), 1)
+
+    def test_close_releases_client_after_last_store(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "qdrant")
+            first = self._local_store(path)
+            second = self._local_store(path)
+
+            first.close()
+            self.assertIn(os.path.abspath(path), qdrant_module._LOCAL_CLIENTS)
+            second.close()
+
+            self.assertNotIn(os.path.abspath(path), qdrant_module._LOCAL_CLIENTS)
+            self.assertTrue(qdrant_module._is_closed(second.client))
+
+    @patch("mem0.memory.main.capture_event")
+    @patch("mem0.utils.factory.LlmFactory.create")
+    @patch("mem0.utils.factory.EmbedderFactory.create")
+    def test_memory_reset_reopens_local_store(self, _embedder, _llm, _capture_event):
+        with tempfile.TemporaryDirectory() as tmp_dir, patch("mem0.memory.main.mem0_dir", tmp_dir):
+            config = MemoryConfig(
+                vector_store={
+                    "provider": "qdrant",
+                    "config": {"path": os.path.join(tmp_dir, "qdrant"), "embedding_model_dims": 4},
+                }
+            )
+            memory = Memory(config=config)
+            self._insert_one(memory.vector_store)
+
+            memory.reset()
+
+            self.assertEqual(memory.vector_store.list()[0], [])
+            self._insert_one(memory.vector_store)
+            self.assertEqual(len(memory.vector_store.list()[0]), 1)
@@ -4,14 +4,29 @@
 import sqlite3
 import sys
 import os
+from contextlib import closing
 from tabulate import tabulate  # You may need to install: pip install tabulate
 
-def view_sqlite_database(db_path):
-    if not os.path.exists(db_path):
-        print(f"Database not found: {db_path}")
-        return
+# Cells are padded or cut to this width so rows line up without scanning the table first
+CELL_WIDTH = 30
+
+def format_row(values):
+    return " | ".join(f"{value!s:<{CELL_WIDTH}.{CELL_WIDTH}}" for value in values)
+
+def connect(db_path):
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    # Read pages through a memory map so repeated scans skip the read() copies
+    conn.execute("PRAGMA mmap_size=268435456;")
+    return conn
+
+def view_sqlite_database(db_path, conn=None):
+    if conn is None:
+        if not os.path.exists(db_path):
+            print(f"Database not found: {db_path}")
+            return
+        with closing(connect(db_path)) as conn:
+            return view_sqlite_database(db_path, conn)
     
-    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     # Get list of tables
@@ -29,25 +44,39 @@ def view_sqlite_database(db_path):
     table_idx = int(input("\nEnter table number to view: ")) - 1
     table_name = tables[table_idx][0]
     
-    # Get table schema
-    cursor.execute(f"PRAGMA table_info({table_name});")
-    columns = cursor.fetchall()
+    # Get table schema; the table-valued pragma takes the name as a bound parameter
+    cursor.execute("SELECT name, type FROM pragma_table_info(?);", (table_name,))
     print(f"\nSchema for {table_name}:")
-    print(tabulate([[col[1], col[2]] for col in columns], headers=["Column", "Type"]))
+    print(tabulate(cursor.fetchall(), headers=["Column", "Type"]))
     
-    # Get data
-    cursor.execute(f"SELECT * FROM {table_name} LIMIT 100;")
-    rows = cursor.fetchall()
-    headers = [col[1] for col in columns]
+    # Get data, printing each row as it is read instead of building the whole grid first. Table names
+    # cannot be bound, but this one came from sqlite_master, so it only needs quoting
+    quoted_name = table_name.replace('"', '""')
+    cursor.execute(f'SELECT * FROM "{quoted_name}" LIMIT 100;')
+    headers = [description[0] for description in cursor.description]
     
     print(f"\nData in {table_name} (first 100 rows):")
-    print(tabulate(rows, headers=headers, tablefmt="psql"))
-    
-    conn.close()
+    print(format_row(headers))
+    print("-+-".join("-" * CELL_WIDTH for _ in headers))
+    for row in cursor:
+        print(format_row(row))
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def main(args):
+    if len(args) < 1:
         print("Usage: python view_db.py <path_to_sqlite_file>")
         sys.exit(1)
     
-    view_sqlite_database(sys.argv[1])
\ No newline at end of file
+    db_path = args[0]
+    if not os.path.exists(db_path):
+        print(f"Database not found: {db_path}")
+        return
+    
+    # One connection serves every table viewed in this session
+    with closing(connect(db_path)) as conn:
+        while True:
+            view_sqlite_database(db_path, conn)
+            if input("\nView another table? [y/N]: ").strip().lower() != "y":
+                break
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
\ No newline at end of file